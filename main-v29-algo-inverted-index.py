@@ -0,0 +1,768 @@
+import os
+import tkinter as tk
+import sys
+import fitz  # PyMuPDF, used for PDF operations
+from tkinter import filedialog
+import re
+import openpyxl
+from difflib import SequenceMatcher
+from datetime import datetime
+from PIL import Image, ImageTk
+import threading
+import logging
+import time
+import csv
+import hashlib
+import json
+import sqlite3
+import zlib
+from multiprocessing import Pool, cpu_count
+
+try:
+    import psutil  # Optional, lets the worker memory ceiling work on every platform
+except ImportError:
+    psutil = None
+
+# Configure logging for detailed debugging
+logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Determine the base path for resources
+if getattr(sys, 'frozen', False):
+    base_path = sys._MEIPASS  # If the script is compiled, use the temporary directory
+else:
+    base_path = os.path.dirname(os.path.abspath(__file__))  # Otherwise, use the script directory
+
+# Paths to the logo images
+image1 = os.path.join(base_path, 'dev-logo.png')
+image2 = os.path.join(base_path, 'dev-logo.png')
+
+# Persistent extraction cache, shared by every run on this machine
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".content_rationalizer")
+EXTRACTION_CACHE_FILE = os.path.join(CACHE_DIR, "extraction_cache.sqlite3")
+EXTRACTION_CACHE_MAX_BYTES = 512 * 1024 * 1024  # Least recently used entries are evicted above this size
+
+# Segmentation settings, bump SEGMENTATION_VERSION whenever the paragraph logic changes
+MERGE_WORD_COUNT = 20
+SEGMENTATION_VERSION = 1
+
+# Extraction workers are recycled after this many files, or when one grows past the memory ceiling.
+# The ceiling needs psutil, or /proc on Linux; without either it is not enforced (e.g. on Windows).
+WORKER_MAX_TASKS = 200
+WORKER_MEMORY_LIMIT_MB = 1024
+
+REPORT_FORMATS = ["excel", "csv", "html"]
+
+
+def hash_paragraph(paragraph):
+    return hashlib.sha256(paragraph.encode('utf-8')).hexdigest()
+
+
+def extract_pdf_paragraphs(file_path, min_char_count):
+    logging.info(f"Extracting text from {file_path} using PyMuPDF.")
+    with fitz.open(file_path) as doc:
+        text = ""
+        for page in doc:
+            text += page.get_text()
+
+    paragraphs = []
+    lines = text.splitlines()
+    paragraph = ""
+    for line in lines:
+        if line.strip():
+            if paragraph:
+                paragraph += " " + line.strip()
+            else:
+                paragraph = line.strip()
+        else:
+            if paragraph:
+                if len(paragraph) >= min_char_count:
+                    paragraphs.append(paragraph.strip())
+                paragraph = ""
+    if paragraph and len(paragraph) >= min_char_count:
+        paragraphs.append(paragraph.strip())
+
+    combined_paragraphs = []
+    temp_paragraph = ""
+    for para in paragraphs:
+        if len(para.split()) < MERGE_WORD_COUNT:
+            temp_paragraph += " " + para
+        else:
+            if temp_paragraph:
+                combined_paragraphs.append(temp_paragraph.strip())
+                temp_paragraph = ""
+            combined_paragraphs.append(para)
+    if temp_paragraph:
+        combined_paragraphs.append(temp_paragraph.strip())
+
+    return combined_paragraphs
+
+
+def extract_paragraphs_from_pdf(file_path, min_char_count):
+    # None marks a failed extraction, so it is retried on the next run instead of being cached
+    try:
+        return extract_pdf_paragraphs(file_path, min_char_count)
+    except Exception as e:
+        logging.error(f"Error extracting text from {file_path}: {str(e)}")
+    return None
+
+
+# SQLite store of extracted paragraphs keyed by PDF content digest and segmentation settings
+class ExtractionCache:
+    def __init__(self, db_path=EXTRACTION_CACHE_FILE, max_bytes=EXTRACTION_CACHE_MAX_BYTES):
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        with self.connection:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS paragraphs ("
+                                    "cache_key TEXT PRIMARY KEY, data BLOB, size INTEGER, last_access REAL)")
+            self.connection.execute("CREATE TABLE IF NOT EXISTS file_digests ("
+                                    "file_path TEXT PRIMARY KEY, file_size INTEGER, file_modified_time REAL, digest TEXT)")
+
+    def file_digest(self, file_path):
+        # Re-hash the file only when its size or modification time has changed since the last run
+        file_stat = os.stat(file_path)
+        with self.lock:
+            row = self.connection.execute("SELECT file_size, file_modified_time, digest FROM file_digests WHERE file_path = ?",
+                                          (file_path,)).fetchone()
+        if row and row[0] == file_stat.st_size and row[1] == file_stat.st_mtime:
+            return row[2]
+
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b''):
+                digest.update(chunk)
+        digest = digest.hexdigest()
+        with self.lock, self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO file_digests VALUES (?, ?, ?, ?)",
+                                    (file_path, file_stat.st_size, file_stat.st_mtime, digest))
+        return digest
+
+    @staticmethod
+    def cache_key(digest, min_char_count):
+        return f"{digest}:{min_char_count}:{MERGE_WORD_COUNT}:{SEGMENTATION_VERSION}"
+
+    def get(self, cache_key):
+        with self.lock, self.connection:
+            row = self.connection.execute("SELECT data FROM paragraphs WHERE cache_key = ?", (cache_key,)).fetchone()
+            if row is None:
+                return None
+            self.connection.execute("UPDATE paragraphs SET last_access = ? WHERE cache_key = ?", (time.time(), cache_key))
+        return json.loads(zlib.decompress(row[0]).decode('utf-8'))
+
+    def put_many(self, entries):
+        now = time.time()
+        rows = []
+        for cache_key, paragraphs in entries:
+            data = zlib.compress(json.dumps(paragraphs).encode('utf-8'))
+            rows.append((cache_key, data, len(data), now))
+        with self.lock, self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO paragraphs VALUES (?, ?, ?, ?)", rows)
+            self.evict()
+
+    def evict(self):
+        total_size = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM paragraphs").fetchone()[0]
+        if total_size <= self.max_bytes:
+            return
+        stale_keys = []
+        for cache_key, size in self.connection.execute("SELECT cache_key, size FROM paragraphs ORDER BY last_access"):
+            if total_size <= self.max_bytes:
+                break
+            stale_keys.append((cache_key,))
+            total_size -= size
+        self.connection.executemany("DELETE FROM paragraphs WHERE cache_key = ?", stale_keys)
+        logging.info(f"Evicted {len(stale_keys)} entries from the extraction cache.")
+
+
+_extraction_cache = None
+
+
+def get_extraction_cache():
+    global _extraction_cache
+    if _extraction_cache is None:
+        _extraction_cache = ExtractionCache()
+    return _extraction_cache
+
+
+def get_process_memory_mb(pid):
+    # Resident memory of a process, or None when it cannot be measured on this platform
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).memory_info().rss / (1024 * 1024)
+        except psutil.Error:
+            return None
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+# Keeps one warm Pool of extraction workers alive between jobs
+class ExtractionPoolManager:
+    def __init__(self, processes=None, max_tasks_per_child=WORKER_MAX_TASKS, memory_limit_mb=WORKER_MEMORY_LIMIT_MB):
+        self.processes = processes or cpu_count()
+        self.max_tasks_per_child = max_tasks_per_child
+        self.memory_limit_mb = memory_limit_mb
+        self.pool = None
+        self.closed = False
+        self.lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+    def get_pool(self):
+        if self.closed:
+            raise RuntimeError("Extraction workers have been shut down.")
+        if self.pool is not None and self.workers_over_memory_limit():
+            logging.info("Recycling extraction workers after exceeding the memory limit.")
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+        if self.pool is None:
+            logging.info(f"Starting {self.processes} extraction workers.")
+            self.pool = Pool(processes=self.processes, maxtasksperchild=self.max_tasks_per_child)
+        return self.pool
+
+    def workers_over_memory_limit(self):
+        # Only this pool's workers count; Pool does not expose them publicly
+        for process in getattr(self.pool, "_pool", []):
+            memory_mb = get_process_memory_mb(process.pid)
+            if memory_mb is not None and memory_mb > self.memory_limit_mb:
+                return True
+        return False
+
+    def warm_up(self):
+        with self.lock:
+            self.get_pool()
+
+    def starmap(self, func, iterable):
+        with self.lock:
+            return self.get_pool().starmap(func, iterable)
+
+    def shutdown(self):
+        with self.lock:
+            if self.pool is not None:
+                logging.info("Shutting down extraction workers.")
+                self.pool.close()
+                self.pool.join()
+                self.pool = None
+
+    def terminate(self):
+        # For window close: kills the workers without waiting for the lock held by a running job,
+        # which then fails instead of starting new workers
+        self.closed = True
+        pool = self.pool
+        if pool is not None:
+            logging.info("Terminating extraction workers.")
+            pool.terminate()
+
+
+def process_pdfs_in_parallel(pdf_paths, min_char_count, pool_manager=None):
+    cache = get_extraction_cache()
+    all_paragraphs = [None] * len(pdf_paths)
+    pending = []
+    for index, pdf_path in enumerate(pdf_paths):
+        cache_key = cache.cache_key(cache.file_digest(pdf_path), min_char_count)
+        paragraphs = cache.get(cache_key)
+        if paragraphs is None:
+            pending.append((index, cache_key))
+        else:
+            all_paragraphs[index] = paragraphs
+    logging.info(f"Extraction cache hits: {len(pdf_paths) - len(pending)}, misses: {len(pending)}")
+
+    if pending:
+        arguments = [(pdf_paths[index], min_char_count) for index, _ in pending]
+        if pool_manager is None:
+            with ExtractionPoolManager() as temporary_pool:
+                extracted = temporary_pool.starmap(extract_paragraphs_from_pdf, arguments)
+        else:
+            extracted = pool_manager.starmap(extract_paragraphs_from_pdf, arguments)
+        for (index, _), paragraphs in zip(pending, extracted):
+            all_paragraphs[index] = paragraphs if paragraphs is not None else []
+        cache.put_many([(cache_key, paragraphs) for (_, cache_key), paragraphs in zip(pending, extracted)
+                        if paragraphs is not None])
+    return all_paragraphs
+
+
+def build_paragraph_index(all_paragraphs):
+    # Inverted index: paragraph -> indexes of the PDFs containing it
+    paragraph_index = {}
+    for pdf_index, paragraphs in enumerate(all_paragraphs):
+        for paragraph in paragraphs:
+            paragraph_index.setdefault(paragraph, set()).add(pdf_index)
+    return paragraph_index
+
+
+def generate_common_hashes_and_matrix(pdf_paths, all_paragraphs):
+    paragraph_index = build_paragraph_index(all_paragraphs)
+    all_hashes = sorted(paragraph_index)
+
+    matrix = [[os.path.basename(pdf_path)] + [0] * len(all_hashes) for pdf_path in pdf_paths]
+    for column, hash_value in enumerate(all_hashes, start=1):
+        for pdf_index in paragraph_index[hash_value]:
+            matrix[pdf_index][column] = 1
+    return all_hashes, matrix
+
+
+def filter_matrix_and_hashes(common_hashes, matrix):
+    filtered_hashes = []
+    filtered_matrix = []
+
+    for i, hash_value in enumerate(common_hashes):
+        if any(row[i + 1] == 1 for row in matrix) and not all(row[i + 1] == 1 for row in matrix):
+            filtered_hashes.append(hash_value)
+
+    for row in matrix:
+        filtered_row = [row[0]] + [row[i + 1] for i, hash_value in enumerate(common_hashes) if hash_value in filtered_hashes]
+        if any(filtered_row[1:]):
+            filtered_matrix.append(filtered_row)
+
+    return filtered_hashes, filtered_matrix
+
+
+def write_results(output_folder, filename_prefix, common_hashes, matrix, file_type):
+    common_hashes, matrix = filter_matrix_and_hashes(common_hashes, matrix)
+
+    current_time = datetime.now()
+    format_time = current_time.strftime("%Y%m%d%H%M%S")
+    if file_type == "excel":
+        output_file = os.path.join(output_folder, f"{filename_prefix}_{format_time}.xlsx")
+        workbook = openpyxl.Workbook(write_only=True)
+        sheet = workbook.create_sheet(title="Common Paragraphs")
+        sheet.append(["Paragraph ID", "Content"])
+        for i, paragraph in enumerate(common_hashes):
+            sheet.append([f"Paragraph {i + 1}", paragraph])
+
+        new_sheet = workbook.create_sheet(title="Matrix")
+        header_row = ["PDF"] + [f"Paragraph {i + 1}" for i in range(len(common_hashes))]
+        new_sheet.append(header_row)
+        for row in matrix:
+            new_sheet.append(row)
+
+        workbook.save(output_file)
+        workbook.close()
+        logging.info(f"Results are saved in the file: {output_file}")
+    elif file_type == "csv":
+        output_csv_common = os.path.join(output_folder, f"{filename_prefix}_common_{format_time}.csv")
+        output_csv_matrix = os.path.join(output_folder, f"{filename_prefix}_matrix_{format_time}.csv")
+
+        # Write Common Paragraphs to CSV
+        with open(output_csv_common, mode='a', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(["Paragraph ID", "Hash"])
+            for i, hash_value in enumerate(common_hashes):
+                writer.writerow([f"Paragraph {i + 1}", hash_value])
+
+        # Write Matrix to CSV
+        with open(output_csv_matrix, mode='a', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            header_row = ["PDF"] + [f"Paragraph {i + 1}" for i in range(len(common_hashes))]
+            writer.writerow(header_row)
+            for row in matrix:
+                writer.writerow(row)
+
+        logging.info(f"CSV Results are saved in the files: {output_csv_common}, {output_csv_matrix}")
+    elif file_type == "html":
+        output_html_file = os.path.join(output_folder, f"{filename_prefix}_{format_time}.html")
+        with open(output_html_file, 'w', encoding='utf-8') as file:
+            file.write("<html><head><title>Rationalized Result</title></head><body>")
+            file.write("<h1>Common Paragraphs</h1>")
+            file.write("<table border='1'><tr><th>Paragraph ID</th><th>Content</th></tr>")
+            for i, paragraph in enumerate(common_hashes):
+                file.write(f"<tr><td>Paragraph {i + 1}</td><td>{paragraph}</td></tr>")
+            file.write("</table>")
+
+            file.write("<h1>Matrix</h1>")
+            file.write("<table border='1'><tr><th>PDF</th>")
+            for i in range(len(common_hashes)):
+                file.write(f"<th>Paragraph {i + 1}</th>")
+            file.write("</tr>")
+            for row in matrix:
+                file.write("<tr>" + "".join([f"<td>{cell}</td>" for cell in row]) + "</tr>")
+            file.write("</table>")
+            file.write("</body></html>")
+
+        logging.info(f"HTML Results are saved in the file: {output_html_file}")
+
+
+def calculate_similarity_matrix(paragraphs):
+    def sort_words(paragraph):
+        return ' '.join(sorted(paragraph.split()))
+
+    sorted_paragraphs = [sort_words(x) for x in paragraphs]
+    matrix = []
+    for para1 in range(0, len(sorted_paragraphs)):
+        temp_list = []
+        for para2 in range(0, len(sorted_paragraphs)):
+            m = SequenceMatcher(None, sorted_paragraphs[para1], sorted_paragraphs[para2])
+            s = m.ratio()
+            temp_list.append(round(s * 100, 2))
+        matrix.append(temp_list)
+    return matrix
+
+
+
+def write_similarity_html(output_folder, filename_prefix, all_paragraphs, similarity_threshold, matrix):
+    current_time = datetime.now()
+    format_time = current_time.strftime("%Y%m%d%H%M%S")
+    output_html_file = os.path.join(output_folder, f"{filename_prefix}_{format_time}.html")
+
+    with open(output_html_file, 'w', encoding='utf-8') as file:
+        file.write("<html><head><title>Similarity Report</title></head><body>")
+        file.write("<h1>Paragraphs</h1>")
+        file.write("<table border='1'><tr><th>Paragraph ID</th><th>Content</th></tr>")
+        for i, paragraph in enumerate(all_paragraphs):
+            clean_paragraph = re.sub(r'[\x00-\x1F\x7F-\x9F]', '', paragraph)
+            file.write(f"<tr><td>Paragraph {i + 1}</td><td>{clean_paragraph}</td></tr>")
+        file.write("</table>")
+
+        file.write("<h1>Similarity Matrix (Above {similarity_threshold}%)</h1>")
+        file.write("<table border='1'><tr><th>Paragraph</th>")
+        for i in range(len(all_paragraphs)):
+            file.write(f"<th>Paragraph {i + 1}</th>")
+        file.write("</tr>")
+        for row_idx, row in enumerate(matrix):
+            filtered_row = [f"<td>{cell}</td>" if cell >= similarity_threshold else "<td></td>" for cell in row]
+            if any(cell >= similarity_threshold for cell in row):
+                file.write(f"<tr><td>Paragraph {row_idx + 1}</td>" + "".join(filtered_row) + "</tr>")
+        file.write("</table>")
+        file.write("</body></html>")
+
+    logging.info(f"HTML Results are saved in the file: {output_html_file}")
+
+
+# Memoizes extracted paragraphs, the presence matrix and similarity results between report runs
+class AnalysisSession:
+    def __init__(self, pool_manager=None):
+        self.pool_manager = pool_manager
+        self.lock = threading.RLock()
+        self.extraction_key = None
+        self.all_paragraphs = None
+        self.rationalization = None
+        self.similarity_key = None
+        self.similarity = None
+
+    @staticmethod
+    def get_folder_signature(pdf_paths):
+        signature = []
+        for pdf_path in pdf_paths:
+            file_stat = os.stat(pdf_path)
+            signature.append((pdf_path, file_stat.st_size, file_stat.st_mtime))
+        return tuple(signature)
+
+    def get_paragraphs(self, pdf_paths, min_char_count):
+        with self.lock:
+            extraction_key = (self.get_folder_signature(pdf_paths), min_char_count)
+            if extraction_key != self.extraction_key:
+                self.all_paragraphs = process_pdfs_in_parallel(pdf_paths, min_char_count, self.pool_manager)
+                self.extraction_key = extraction_key
+                self.rationalization = None
+                self.similarity_key = None
+                self.similarity = None
+            else:
+                logging.info("Reusing extracted paragraphs from the current session.")
+            return self.all_paragraphs
+
+    def get_rationalization(self, pdf_paths, min_char_count):
+        with self.lock:
+            all_paragraphs = self.get_paragraphs(pdf_paths, min_char_count)
+            if self.rationalization is None:
+                self.rationalization = generate_common_hashes_and_matrix(pdf_paths, all_paragraphs)
+            return self.rationalization
+
+    def get_similarity(self, pdf_paths, min_char_count, similarity_threshold):
+        with self.lock:
+            all_paragraphs = self.get_paragraphs(pdf_paths, min_char_count)
+            if similarity_threshold != self.similarity_key:
+                combined_paragraphs = [para for sublist in all_paragraphs for para in sublist]
+                self.similarity = combined_paragraphs, calculate_similarity_matrix(combined_paragraphs)
+                self.similarity_key = similarity_threshold
+            return self.similarity
+
+
+class PDFComparerApp:
+    def __init__(self, master):
+        self.master = master
+        master.title("PDF Comparer Tool")
+
+        # Variables to store input and output folder paths
+        self.input_folder_path = tk.StringVar()
+        self.output_folder_path = tk.StringVar()
+        self.min_char_count = tk.IntVar(value=100)  # Default minimum character count
+        self.similarity_threshold = tk.IntVar(value=90)  # Default similarity threshold percentage
+
+        # Extraction workers stay alive between button clicks and are started in the background
+        self.pool_manager = ExtractionPoolManager()
+        threading.Thread(target=self.pool_manager.warm_up, daemon=True).start()
+        master.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        # Extraction and comparison results are reused until the folder or settings change
+        self.session = AnalysisSession(self.pool_manager)
+
+        # Create GUI elements
+        self.create_widgets()
+
+    def on_close(self):
+        self.pool_manager.terminate()
+        self.master.destroy()
+
+    def create_widgets(self):
+        # Tkinter widgets for the UI
+        self.configure_window()
+        self.create_heading_frame()
+        self.create_input_output_frames()
+        self.create_min_char_count_frame()
+        self.create_similarity_threshold_frame()
+        self.create_compare_buttons()
+
+    def configure_window(self):
+        screen_width = self.master.winfo_screenwidth()
+        screen_height = self.master.winfo_screenheight()
+        x_position = (screen_width - 980) // 2
+        y_position = (screen_height - 680) // 2
+        self.master.geometry(f"980x680+{x_position}+{y_position}")
+
+    def create_heading_frame(self):
+        heading_frame = tk.Frame(self.master, bg="#1a1a2e")
+        heading_frame.pack(fill=tk.X, pady=10, padx=10)
+
+        self.load_image(heading_frame, image1, "left")
+        heading_label = self.create_label(heading_frame, "Content Rationalizer", font=("Helvetica", 26, "bold"),
+                                          bg="#1a1a2e", fg="white")
+        heading_label.pack(side="left", expand=True)
+        self.load_image(heading_frame, image2, "right")
+
+    def load_image(self, frame, image_path, side):
+        try:
+            if os.path.exists(image_path):
+                original_image = Image.open(image_path).resize((80, 80), Image.LANCZOS)
+                photo = ImageTk.PhotoImage(original_image)
+                image_label = tk.Label(frame, image=photo, bg="#1a1a2e")
+                image_label.image = photo  # Keep reference to avoid garbage collection
+                image_label.pack(side=side, padx=10)
+            else:
+                raise FileNotFoundError(f"Image file not found: {image_path}")
+        except Exception as e:
+            logging.error(f"Error loading image: {str(e)}")
+
+    def create_input_output_frames(self):
+        self.create_folder_frame("Input Folder ", self.input_folder_path, self.browse_input_folder)
+        self.create_folder_frame("Output Folder ", self.output_folder_path, self.browse_output_folder)
+
+    def create_min_char_count_frame(self):
+        frame = tk.Frame(self.master)
+        frame.pack(pady=10)
+        self.create_label(frame, "Minimum Character Count for Rationalization and Percentage Reports: ", font=("Helvetica", 12)).pack(side=tk.LEFT)
+        self.create_entry(frame, textvariable=self.min_char_count, width=10).pack(side=tk.LEFT, padx=(5, 0))
+
+    def create_similarity_threshold_frame(self):
+        frame = tk.Frame(self.master)
+        frame.pack(pady=10)
+        self.create_label(frame, "Minimum Similarity Percentage for Percentage Match Reports Only: ", font=("Helvetica", 12)).pack(side=tk.LEFT)
+        self.create_entry(frame, textvariable=self.similarity_threshold, width=10).pack(side=tk.LEFT, padx=(5, 0))
+
+    def create_folder_frame(self, label_text, path_variable, browse_command):
+        frame = tk.Frame(self.master)
+        frame.pack(pady=10)
+        self.create_label(frame, label_text, font=("Helvetica", 12)).pack(side=tk.LEFT)
+        self.create_entry(frame, textvariable=path_variable, width=50).pack(side=tk.LEFT, padx=(5, 0))
+        self.create_button(frame, "Browse", browse_command, font=("Helvetica", 10), width=10).pack(side=tk.LEFT,
+                                                                                                   padx=(10, 0))
+
+    def create_compare_buttons(self):
+        compare_frame = tk.Frame(self.master, bg="#1a1a2e")
+        compare_frame.pack(pady=20, padx=10, fill=tk.X)
+
+        button_texts = [
+            "Rationalise (Excel)",
+            "Rationalise (CSV)",
+            "Rationalise (HTML)",
+            "Percentage Match (Excel)",
+            "Percentage Match (CSV)",
+            "Percentage Match (HTML)"
+        ]
+
+        button_commands = [
+            self.compare_pdfs_excel,
+            self.compare_pdfs_csv,
+            self.compare_pdfs_html,
+            self.compare_similarity_excel,
+            self.compare_similarity_csv,
+            self.compare_similarity_html
+        ]
+
+        for i in range(len(button_texts)):
+            button = self.create_button(compare_frame, button_texts[i],
+                                        lambda cmd=button_commands[i]: threading.Thread(target=cmd, daemon=True).start(),
+                                        font=("Helvetica", 10, "bold"), width=25, height=2, bg="white")
+            button.grid(row=i // 3, column=i % 3, padx=10, pady=10, sticky='nsew')
+
+        all_formats_button = self.create_button(compare_frame, "Generate All Formats",
+                                                lambda: threading.Thread(target=self.generate_all_reports, daemon=True).start(),
+                                                font=("Helvetica", 10, "bold"), height=2, bg="white")
+        all_formats_button.grid(row=2, column=0, columnspan=3, padx=10, pady=10, sticky='nsew')
+
+        for i in range(3):
+            compare_frame.grid_columnconfigure(i, weight=1)
+
+    def create_label(self, frame, text, **kwargs):
+        return tk.Label(frame, text=text, **kwargs)
+
+    def create_entry(self, frame, textvariable, **kwargs):
+        return tk.Entry(frame, textvariable=textvariable, **kwargs)
+
+    def create_button(self, frame, text, command, **kwargs):
+        return tk.Button(frame, text=text, command=command, **kwargs)
+
+    def browse_input_folder(self):
+        folder_path = filedialog.askdirectory()
+        if folder_path:
+            self.input_folder_path.set(folder_path)
+
+    def browse_output_folder(self):
+        folder_path = filedialog.askdirectory()
+        if folder_path:
+            self.output_folder_path.set(folder_path)
+
+    def compare_pdfs_excel(self):
+        self.generate_reports(rationalization_formats=["excel"])
+
+    def compare_pdfs_csv(self):
+        self.generate_reports(rationalization_formats=["csv"])
+
+    def compare_pdfs_html(self):
+        self.generate_reports(rationalization_formats=["html"])
+
+    def compare_similarity_excel(self):
+        self.generate_reports(similarity_formats=["excel"])
+
+    def compare_similarity_csv(self):
+        self.generate_reports(similarity_formats=["csv"])
+
+    def compare_similarity_html(self):
+        self.generate_reports(similarity_formats=["html"])
+
+    def generate_all_reports(self):
+        self.generate_reports(REPORT_FORMATS, REPORT_FORMATS)
+
+    def generate_reports(self, rationalization_formats=(), similarity_formats=()):
+        input_folder, output_folder, pdf_paths = self.get_input_output_paths()
+        if not pdf_paths:
+            return
+
+        start_time = time.time()
+        logging.info(f"Total PDF files to process: {len(pdf_paths)}")
+        min_char_count = self.min_char_count.get()
+
+        if rationalization_formats:
+            try:
+                common_hashes, matrix = self.session.get_rationalization(pdf_paths, min_char_count)
+                for file_type in rationalization_formats:
+                    write_results(output_folder, "rationalized_result", common_hashes, matrix, file_type)
+            except Exception as e:
+                logging.error(f"Error during comparison: {str(e)}")
+
+        if similarity_formats:
+            try:
+                similarity_threshold = self.similarity_threshold.get()
+                combined_paragraphs, matrix = self.session.get_similarity(pdf_paths, min_char_count, similarity_threshold)
+                for file_type in similarity_formats:
+                    self.write_similarity_report(output_folder, file_type, combined_paragraphs, similarity_threshold, matrix)
+            except Exception as e:
+                logging.error(f"Error during similarity comparison: {str(e)}")
+
+        self.log_processing_time(start_time)
+
+    def write_similarity_report(self, output_folder, file_type, all_paragraphs, similarity_threshold, matrix):
+        if file_type == "excel":
+            self.save_similarity_excel(output_folder, "percentage_report", all_paragraphs, similarity_threshold, matrix)
+        elif file_type == "csv":
+            self.save_similarity_csv(output_folder, "percentage_report", all_paragraphs, similarity_threshold, matrix)
+        elif file_type == "html":
+            write_similarity_html(output_folder, "percentage_report", all_paragraphs, similarity_threshold, matrix)
+
+    def get_input_output_paths(self):
+        input_folder = self.input_folder_path.get()
+        output_folder = self.output_folder_path.get()
+
+        if not input_folder or not output_folder:
+            logging.error("Input and output folders must be selected.")
+            return None, None, None
+
+        pdf_paths = [os.path.join(input_folder, f) for f in os.listdir(input_folder) if f.endswith('.pdf')]
+        if not pdf_paths:
+            logging.error("No PDF files found in the input folder.")
+            return None, None, None
+
+        return input_folder, output_folder, pdf_paths
+
+    def save_similarity_excel(self, output_folder, filename_prefix, all_paragraphs, similarity_threshold, matrix):
+        current_time = datetime.now()
+        format_time = current_time.strftime("%Y%m%d%H%M%S")
+        output_file = os.path.join(output_folder, f"{filename_prefix}_{format_time}.xlsx")
+
+        workbook = openpyxl.Workbook(write_only=True)
+        sheet = workbook.create_sheet(title="Paragraphs")
+        sheet.append(["Paragraph ID", "Content"])
+        for i, paragraph in enumerate(all_paragraphs):
+            clean_paragraph = re.sub(r'[\x00-\x1F\x7F-\x9F]', '', paragraph)
+            sheet.append([f"Paragraph {i + 1}", clean_paragraph])
+
+        new_sheet = workbook.create_sheet(title=f"Similarity Matrix (Above {similarity_threshold}%)")
+        header_row = ["Paragraph"] + [f"Paragraph {i + 1}" for i in range(len(all_paragraphs))]
+        new_sheet.append(header_row)
+
+        for row_idx, row in enumerate(matrix):
+            if any(cell >= similarity_threshold for cell in row):
+                filtered_row = [cell if cell >= similarity_threshold else None for cell in row]
+                final_row = [f"Paragraph {row_idx + 1}"] + filtered_row
+                new_sheet.append(final_row)
+
+        workbook.save(output_file)
+        workbook.close()
+        logging.info(f"Results are saved in the file: {output_file}")
+
+    def save_similarity_csv(self, output_folder, filename_prefix, all_paragraphs, similarity_threshold, matrix):
+        current_time = datetime.now()
+        format_time = current_time.strftime("%Y%m%d%H%M%S")
+        output_csv_paragraphs = os.path.join(output_folder, f"{filename_prefix}_paragraphs_{format_time}.csv")
+        output_csv_matrix = os.path.join(output_folder, f"{filename_prefix}_matrix_{format_time}.csv")
+
+        # Write Paragraphs to CSV
+        with open(output_csv_paragraphs, mode='a', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(["Paragraph ID", "Content"])
+            for i, paragraph in enumerate(all_paragraphs):
+                clean_paragraph = re.sub(r'[\x00-\x1F\x7F-\x9F]', '', paragraph)
+                writer.writerow([f"Paragraph {i + 1}", clean_paragraph])
+
+        # Write Similarity Matrix to CSV
+        with open(output_csv_matrix, mode='a', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            header_row = ["Paragraph"] + [f"Paragraph {i + 1}" for i in range(len(all_paragraphs))]
+            writer.writerow(header_row)
+            for row_idx, row in enumerate(matrix):
+                if any(cell >= similarity_threshold for cell in row):
+                    filtered_row = [cell if cell >= similarity_threshold else '' for cell in row]
+                    writer.writerow([f"Paragraph {row_idx + 1}"] + filtered_row)
+
+        logging.info(f"CSV Results are saved in the files: {output_csv_paragraphs}, {output_csv_matrix}")
+
+    def log_processing_time(self, start_time):
+        end_time = time.time()
+        elapsed_time = end_time - start_time
+        logging.info(f"Processing completed in {elapsed_time:.2f} seconds.")
+
+
+if __name__ == "__main__":
+    root = tk.Tk()
+    root.configure(bg="#1a1a2e")
+    app = PDFComparerApp(root)
+    root.mainloop()
@@ -0,0 +1,1987 @@
+import os
+import tkinter as tk
+import sys
+import fitz  # PyMuPDF, used for PDF operations
+from tkinter import filedialog
+import re
+import openpyxl
+import numpy as np
+from difflib import SequenceMatcher
+from datetime import datetime
+from PIL import Image, ImageTk
+import threading
+import logging
+import time
+import csv
+import argparse
+import hashlib
+import gzip
+import heapq
+import json
+import sqlite3
+import zlib
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from multiprocessing import Pool, cpu_count
+
+try:
+    import psutil  # Optional, lets the worker memory ceiling work on every platform
+except ImportError:
+    psutil = None
+
+try:
+    import xxhash  # Optional, much faster non-cryptographic paragraph fingerprints
+except ImportError:
+    xxhash = None
+
+try:
+    from scipy import sparse  # Optional, enables the bag-of-words Cosine and Jaccard scorers
+except ImportError:
+    sparse = None
+
+# Configure logging for detailed debugging
+logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Determine the base path for resources
+if getattr(sys, 'frozen', False):
+    base_path = sys._MEIPASS  # If the script is compiled, use the temporary directory
+else:
+    base_path = os.path.dirname(os.path.abspath(__file__))  # Otherwise, use the script directory
+
+# Paths to the logo images
+image1 = os.path.join(base_path, 'dev-logo.png')
+image2 = os.path.join(base_path, 'dev-logo.png')
+
+# Persistent extraction cache, shared by every run on this machine
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".content_rationalizer")
+EXTRACTION_CACHE_FILE = os.path.join(CACHE_DIR, "extraction_cache.sqlite3")
+EXTRACTION_CACHE_MAX_BYTES = 512 * 1024 * 1024  # Least recently used entries are evicted above this size
+
+# Persistent cache of SequenceMatcher scores between pairs of paragraphs
+SIMILARITY_CACHE_FILE = os.path.join(CACHE_DIR, "similarity_cache.sqlite3")
+SIMILARITY_CACHE_MAX_PAIRS = 5_000_000  # Least recently used pairs are evicted above this count
+
+# Incremental percentage match keeps the paragraphs and pairs of the last run in the output folder
+SIMILARITY_STATE_FILE = "percentage_match_state.json.gz"
+SIMILARITY_STATE_VERSION = 2
+
+# Segmentation settings, bump SEGMENTATION_VERSION whenever the paragraph logic changes
+MERGE_WORD_COUNT = 20
+SEGMENTATION_VERSION = 2
+
+# Extraction workers are recycled after this many files, or when one grows past the memory ceiling.
+# The ceiling needs psutil, or /proc on Linux; without either it is not enforced (e.g. on Windows).
+WORKER_MAX_TASKS = 200
+WORKER_MEMORY_LIMIT_MB = 1024
+
+REPORT_FORMATS = ["excel", "csv", "html"]
+SIMILARITY_OUTPUTS = ["Matrix", "Pair List", "Clusters", "Top-k"]
+SIMILARITY_SCOPES = ["All Pairs", "Cross-Document"]
+SPARSE_SCORERS = ["Cosine", "Jaccard"]
+SIMILARITY_SCORERS = ["Characters", "Words"] + (SPARSE_SCORERS if sparse is not None else [])
+SPARSE_BLOCK_CELLS = 1 << 24  # Rows per block of the sparse product are chosen to stay under this many cells
+DEFAULT_TOP_K = 5
+
+# Rows unpacked at a time when filtering the bit-packed presence matrix
+MATRIX_BLOCK_ROWS = 256
+
+# MinHash / LSH candidate generation, an opt-in approximate prefilter for percentage match: pairs it does not
+# propose are never scored. Recall is tuned with the band layout: more bands or fewer rows per band find more pairs.
+LSH_SHINGLE_SIZE = 2
+LSH_BANDS = 32
+LSH_ROWS_PER_BAND = 4
+MINHASH_PRIME = (1 << 31) - 1
+
+# Similarity scoring is spread over worker processes from this many paragraphs upwards
+PARALLEL_SIMILARITY_MIN_PARAGRAPHS = 500
+SIMILARITY_BLOCKS_PER_WORKER = 4
+
+
+def sha256_fingerprint(data):
+    return int.from_bytes(hashlib.sha256(data).digest()[:16], 'big')
+
+
+def blake2b_fingerprint(data):
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'big')
+
+
+def xxh64_fingerprint(data):
+    return xxhash.xxh64_intdigest(data)
+
+
+# Paragraphs are keyed by a fixed-size integer fingerprint instead of their full text
+FINGERPRINT_FUNCTIONS = {
+    "sha256": sha256_fingerprint,  # 128 bits, truncated SHA-256
+    "blake2b": blake2b_fingerprint,  # 64 bits
+}
+if xxhash is not None:
+    FINGERPRINT_FUNCTIONS["xxh64"] = xxh64_fingerprint  # 64 bits, non-cryptographic
+DEFAULT_FINGERPRINT = "xxh64" if xxhash is not None else "blake2b"
+
+
+def hash_paragraph(paragraph, fingerprint=DEFAULT_FINGERPRINT):
+    return FINGERPRINT_FUNCTIONS[fingerprint](paragraph.encode('utf-8'))
+
+
+# Paragraphs of one PDF with the 1-based page each one starts on; the ordinal of a paragraph is its index + 1
+ExtractedDocument = namedtuple("ExtractedDocument", ["paragraphs", "pages"])
+
+
+def extract_pdf_paragraphs(file_path, min_char_count):
+    logging.info(f"Extracting text from {file_path} using PyMuPDF.")
+    with fitz.open(file_path) as doc:
+        text = ""
+        page_starts = []
+        for page in doc:
+            page_starts.append(len(text))
+            text += page.get_text()
+
+    paragraphs = []
+    pages = []
+    paragraph = ""
+    paragraph_page = 0
+    offset = 0
+    for line in text.splitlines(keepends=True):
+        line_page = bisect_right(page_starts, offset)
+        offset += len(line)
+        if line.strip():
+            if paragraph:
+                paragraph += " " + line.strip()
+            else:
+                paragraph = line.strip()
+                paragraph_page = line_page
+        else:
+            if paragraph:
+                if len(paragraph) >= min_char_count:
+                    paragraphs.append(paragraph.strip())
+                    pages.append(paragraph_page)
+                paragraph = ""
+    if paragraph and len(paragraph) >= min_char_count:
+        paragraphs.append(paragraph.strip())
+        pages.append(paragraph_page)
+
+    combined_paragraphs = []
+    combined_pages = []
+    temp_paragraph = ""
+    temp_page = 0
+    for para, page in zip(paragraphs, pages):
+        if len(para.split()) < MERGE_WORD_COUNT:
+            if not temp_paragraph:
+                temp_page = page
+            temp_paragraph += " " + para
+        else:
+            if temp_paragraph:
+                combined_paragraphs.append(temp_paragraph.strip())
+                combined_pages.append(temp_page)
+                temp_paragraph = ""
+            combined_paragraphs.append(para)
+            combined_pages.append(page)
+    if temp_paragraph:
+        combined_paragraphs.append(temp_paragraph.strip())
+        combined_pages.append(temp_page)
+
+    return ExtractedDocument(combined_paragraphs, combined_pages)
+
+
+def extract_paragraphs_from_pdf(file_path, min_char_count):
+    # None marks a failed extraction, so it is retried on the next run instead of being cached
+    try:
+        return extract_pdf_paragraphs(file_path, min_char_count)
+    except Exception as e:
+        logging.error(f"Error extracting text from {file_path}: {str(e)}")
+    return None
+
+
+# SQLite store of extracted paragraphs keyed by PDF content digest and segmentation settings
+class ExtractionCache:
+    def __init__(self, db_path=EXTRACTION_CACHE_FILE, max_bytes=EXTRACTION_CACHE_MAX_BYTES):
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        with self.connection:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS paragraphs ("
+                                    "cache_key TEXT PRIMARY KEY, data BLOB, size INTEGER, last_access REAL)")
+            self.connection.execute("CREATE TABLE IF NOT EXISTS file_digests ("
+                                    "file_path TEXT PRIMARY KEY, file_size INTEGER, file_modified_time REAL, digest TEXT)")
+
+    def file_digest(self, file_path):
+        # Re-hash the file only when its size or modification time has changed since the last run
+        file_stat = os.stat(file_path)
+        with self.lock:
+            row = self.connection.execute("SELECT file_size, file_modified_time, digest FROM file_digests WHERE file_path = ?",
+                                          (file_path,)).fetchone()
+        if row and row[0] == file_stat.st_size and row[1] == file_stat.st_mtime:
+            return row[2]
+
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b''):
+                digest.update(chunk)
+        digest = digest.hexdigest()
+        with self.lock, self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO file_digests VALUES (?, ?, ?, ?)",
+                                    (file_path, file_stat.st_size, file_stat.st_mtime, digest))
+        return digest
+
+    @staticmethod
+    def cache_key(digest, min_char_count):
+        return f"{digest}:{min_char_count}:{MERGE_WORD_COUNT}:{SEGMENTATION_VERSION}"
+
+    def get(self, cache_key):
+        with self.lock, self.connection:
+            row = self.connection.execute("SELECT data FROM paragraphs WHERE cache_key = ?", (cache_key,)).fetchone()
+            if row is None:
+                return None
+            self.connection.execute("UPDATE paragraphs SET last_access = ? WHERE cache_key = ?", (time.time(), cache_key))
+        return ExtractedDocument(*json.loads(zlib.decompress(row[0]).decode('utf-8')))
+
+    def put_many(self, entries):
+        now = time.time()
+        rows = []
+        for cache_key, document in entries:
+            data = zlib.compress(json.dumps(document).encode('utf-8'))
+            rows.append((cache_key, data, len(data), now))
+        with self.lock, self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO paragraphs VALUES (?, ?, ?, ?)", rows)
+            self.evict()
+
+    def evict(self):
+        total_size = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM paragraphs").fetchone()[0]
+        if total_size <= self.max_bytes:
+            return
+        stale_keys = []
+        for cache_key, size in self.connection.execute("SELECT cache_key, size FROM paragraphs ORDER BY last_access"):
+            if total_size <= self.max_bytes:
+                break
+            stale_keys.append((cache_key,))
+            total_size -= size
+        self.connection.executemany("DELETE FROM paragraphs WHERE cache_key = ?", stale_keys)
+        logging.info(f"Evicted {len(stale_keys)} entries from the extraction cache.")
+
+
+_extraction_cache = None
+
+
+def get_extraction_cache():
+    global _extraction_cache
+    if _extraction_cache is None:
+        _extraction_cache = ExtractionCache()
+    return _extraction_cache
+
+
+def get_process_memory_mb(pid):
+    # Resident memory of a process, or None when it cannot be measured on this platform
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).memory_info().rss / (1024 * 1024)
+        except psutil.Error:
+            return None
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+# Keeps one warm Pool of extraction workers alive between jobs
+class ExtractionPoolManager:
+    def __init__(self, processes=None, max_tasks_per_child=WORKER_MAX_TASKS, memory_limit_mb=WORKER_MEMORY_LIMIT_MB):
+        self.processes = processes or cpu_count()
+        self.max_tasks_per_child = max_tasks_per_child
+        self.memory_limit_mb = memory_limit_mb
+        self.pool = None
+        self.closed = False
+        self.lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+    def get_pool(self):
+        if self.closed:
+            raise RuntimeError("Extraction workers have been shut down.")
+        if self.pool is not None and self.workers_over_memory_limit():
+            logging.info("Recycling extraction workers after exceeding the memory limit.")
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+        if self.pool is None:
+            logging.info(f"Starting {self.processes} extraction workers.")
+            self.pool = Pool(processes=self.processes, maxtasksperchild=self.max_tasks_per_child)
+        return self.pool
+
+    def workers_over_memory_limit(self):
+        # Only this pool's workers count; Pool does not expose them publicly
+        for process in getattr(self.pool, "_pool", []):
+            memory_mb = get_process_memory_mb(process.pid)
+            if memory_mb is not None and memory_mb > self.memory_limit_mb:
+                return True
+        return False
+
+    def warm_up(self):
+        with self.lock:
+            self.get_pool()
+
+    def starmap(self, func, iterable):
+        with self.lock:
+            return self.get_pool().starmap(func, iterable)
+
+    def shutdown(self):
+        with self.lock:
+            if self.pool is not None:
+                logging.info("Shutting down extraction workers.")
+                self.pool.close()
+                self.pool.join()
+                self.pool = None
+
+    def terminate(self):
+        # For window close: kills the workers without waiting for the lock held by a running job,
+        # which then fails instead of starting new workers
+        self.closed = True
+        pool = self.pool
+        if pool is not None:
+            logging.info("Terminating extraction workers.")
+            pool.terminate()
+
+
+def process_pdfs_in_parallel(pdf_paths, min_char_count, pool_manager=None):
+    # Returns one ExtractedDocument per PDF, in the order of pdf_paths
+    cache = get_extraction_cache()
+    documents = [None] * len(pdf_paths)
+    pending = []
+    for index, pdf_path in enumerate(pdf_paths):
+        cache_key = cache.cache_key(cache.file_digest(pdf_path), min_char_count)
+        document = cache.get(cache_key)
+        if document is None:
+            pending.append((index, cache_key))
+        else:
+            documents[index] = document
+    logging.info(f"Extraction cache hits: {len(pdf_paths) - len(pending)}, misses: {len(pending)}")
+
+    if pending:
+        arguments = [(pdf_paths[index], min_char_count) for index, _ in pending]
+        if pool_manager is None:
+            with ExtractionPoolManager() as temporary_pool:
+                extracted = temporary_pool.starmap(extract_paragraphs_from_pdf, arguments)
+        else:
+            extracted = pool_manager.starmap(extract_paragraphs_from_pdf, arguments)
+        for (index, _), document in zip(pending, extracted):
+            documents[index] = document if document is not None else ExtractedDocument([], [])
+        cache.put_many([(cache_key, document) for (_, cache_key), document in zip(pending, extracted)
+                        if document is not None])
+    return documents
+
+
+def build_paragraph_index(all_paragraphs, fingerprint=DEFAULT_FINGERPRINT):
+    # Inverted index: paragraph fingerprint -> indexes of the PDFs containing it.
+    # The text of each paragraph is kept once, in order of first appearance.
+    fingerprint_function = FINGERPRINT_FUNCTIONS[fingerprint]
+    paragraph_index = {}
+    paragraph_texts = {}
+    for pdf_index, paragraphs in enumerate(all_paragraphs):
+        for paragraph in paragraphs:
+            hash_value = fingerprint_function(paragraph.encode('utf-8'))
+            pdf_indexes = paragraph_index.get(hash_value)
+            if pdf_indexes is None:
+                paragraph_index[hash_value] = pdf_indexes = set()
+                paragraph_texts[hash_value] = paragraph
+            pdf_indexes.add(pdf_index)
+    return paragraph_index, paragraph_texts
+
+
+# PDF x paragraph presence matrix packed to one bit per cell, rows are unpacked only when written
+class PresenceMatrix:
+    def __init__(self, pdf_names, column_count, bits=None):
+        self.pdf_names = list(pdf_names)
+        self.column_count = column_count
+        if bits is None:
+            bits = np.zeros((len(self.pdf_names), (column_count + 7) // 8), dtype=np.uint8)
+        self.bits = bits
+
+    @classmethod
+    def from_index(cls, pdf_names, columns, paragraph_index):
+        matrix = cls(pdf_names, len(columns))
+        row_indexes = []
+        column_indexes = []
+        for column, key in enumerate(columns):
+            for pdf_index in paragraph_index[key]:
+                row_indexes.append(pdf_index)
+                column_indexes.append(column)
+        row_indexes = np.array(row_indexes, dtype=np.intp)
+        column_indexes = np.array(column_indexes, dtype=np.intp)
+        masks = np.right_shift(0x80, column_indexes & 7).astype(np.uint8)
+        np.bitwise_or.at(matrix.bits, (row_indexes, column_indexes >> 3), masks)
+        return matrix
+
+    def __len__(self):
+        return len(self.pdf_names)
+
+    def unpack(self, start, stop):
+        return np.unpackbits(self.bits[start:stop], axis=1, count=self.column_count)
+
+    def row_values(self, row):
+        return np.unpackbits(self.bits[row], count=self.column_count).tolist()
+
+    def iter_rows(self):
+        for row, pdf_name in enumerate(self.pdf_names):
+            yield [pdf_name] + self.row_values(row)
+
+    def column_counts(self):
+        # Number of PDFs containing each paragraph, summed one block of unpacked rows at a time
+        counts = np.zeros(self.column_count, dtype=np.int64)
+        for start in range(0, len(self), MATRIX_BLOCK_ROWS):
+            counts += self.unpack(start, start + MATRIX_BLOCK_ROWS).sum(axis=0, dtype=np.int64)
+        return counts
+
+    def select(self, rows, column_mask=None):
+        rows = np.asarray(rows, dtype=np.intp)
+        if column_mask is None:
+            return PresenceMatrix([self.pdf_names[row] for row in rows], self.column_count, self.bits[rows])
+        selected = PresenceMatrix([self.pdf_names[row] for row in rows], int(np.count_nonzero(column_mask)))
+        for start in range(0, len(rows), MATRIX_BLOCK_ROWS):
+            block_rows = rows[start:start + MATRIX_BLOCK_ROWS]
+            block = np.unpackbits(self.bits[block_rows], axis=1, count=self.column_count)[:, column_mask]
+            selected.bits[start:start + len(block_rows)] = np.packbits(block, axis=1)
+        return selected
+
+
+def generate_common_hashes_and_matrix(pdf_paths, all_paragraphs, fingerprint=DEFAULT_FINGERPRINT):
+    paragraph_index, paragraph_texts = build_paragraph_index(all_paragraphs, fingerprint)
+    all_hashes = list(paragraph_index)
+    pdf_names = [os.path.basename(pdf_path) for pdf_path in pdf_paths]
+    return all_hashes, PresenceMatrix.from_index(pdf_names, all_hashes, paragraph_index), paragraph_texts
+
+
+def filter_matrix_and_hashes(common_hashes, matrix):
+    # Drop paragraphs found in every PDF, then PDFs left without any paragraph
+    document_frequency = matrix.column_counts()
+    column_mask = (document_frequency > 0) & (document_frequency < len(matrix))
+    filtered_hashes = [hash_value for hash_value, keep in zip(common_hashes, column_mask) if keep]
+    filtered_matrix = matrix.select(np.arange(len(matrix)), column_mask)
+    filtered_matrix = filtered_matrix.select(np.flatnonzero(filtered_matrix.bits.any(axis=1)))
+    return filtered_hashes, filtered_matrix, document_frequency[column_mask]
+
+
+def summarize_document_frequency(document_frequency, pdf_count):
+    bucket_counts = np.bincount(document_frequency, minlength=pdf_count + 1)
+    return [(f"{k} of {pdf_count} PDFs", int(bucket_counts[k])) for k in range(1, pdf_count + 1) if bucket_counts[k]]
+
+
+def write_results(output_folder, filename_prefix, common_hashes, matrix, paragraph_texts, file_type):
+    pdf_count = len(matrix)
+    common_hashes, matrix, document_frequency = filter_matrix_and_hashes(common_hashes, matrix)
+    frequency_buckets = summarize_document_frequency(document_frequency, pdf_count)
+
+    current_time = datetime.now()
+    format_time = current_time.strftime("%Y%m%d%H%M%S")
+    if file_type == "excel":
+        output_file = os.path.join(output_folder, f"{filename_prefix}_{format_time}.xlsx")
+        workbook = openpyxl.Workbook(write_only=True)
+        sheet = workbook.create_sheet(title="Common Paragraphs")
+        sheet.append(["Paragraph ID", "Content", "PDF Count", "Present In"])
+        for i, hash_value in enumerate(common_hashes):
+            sheet.append([f"Paragraph {i + 1}", paragraph_texts[hash_value], int(document_frequency[i]),
+                          f"{document_frequency[i]} of {pdf_count} PDFs"])
+
+        new_sheet = workbook.create_sheet(title="Matrix")
+        header_row = ["PDF"] + [f"Paragraph {i + 1}" for i in range(len(common_hashes))]
+        new_sheet.append(header_row)
+        for row in matrix.iter_rows():
+            new_sheet.append(row)
+
+        frequency_sheet = workbook.create_sheet(title="Document Frequency")
+        frequency_sheet.append(["Present In", "Paragraphs"])
+        for bucket in frequency_buckets:
+            frequency_sheet.append(list(bucket))
+
+        workbook.save(output_file)
+        workbook.close()
+        logging.info(f"Results are saved in the file: {output_file}")
+    elif file_type == "csv":
+        output_csv_common = os.path.join(output_folder, f"{filename_prefix}_common_{format_time}.csv")
+        output_csv_matrix = os.path.join(output_folder, f"{filename_prefix}_matrix_{format_time}.csv")
+        output_csv_frequency = os.path.join(output_folder, f"{filename_prefix}_frequency_{format_time}.csv")
+
+        # Write Common Paragraphs to CSV
+        with open(output_csv_common, mode='a', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(["Paragraph ID", "Hash", "Content", "PDF Count", "Present In"])
+            for i, hash_value in enumerate(common_hashes):
+                writer.writerow([f"Paragraph {i + 1}", f"{hash_value:x}", paragraph_texts[hash_value], document_frequency[i],
+                                 f"{document_frequency[i]} of {pdf_count} PDFs"])
+
+        # Write Matrix to CSV
+        with open(output_csv_matrix, mode='a', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            header_row = ["PDF"] + [f"Paragraph {i + 1}" for i in range(len(common_hashes))]
+            writer.writerow(header_row)
+            for row in matrix.iter_rows():
+                writer.writerow(row)
+
+        # Write Document Frequency buckets to CSV
+        with open(output_csv_frequency, mode='a', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(["Present In", "Paragraphs"])
+            writer.writerows(frequency_buckets)
+
+        logging.info(f"CSV Results are saved in the files: {output_csv_common}, {output_csv_matrix}, {output_csv_frequency}")
+    elif file_type == "html":
+        output_html_file = os.path.join(output_folder, f"{filename_prefix}_{format_time}.html")
+        with open(output_html_file, 'w', encoding='utf-8') as file:
+            file.write("<html><head><title>Rationalized Result</title></head><body>")
+            file.write("<h1>Common Paragraphs</h1>")
+            file.write("<table border='1'><tr><th>Paragraph ID</th><th>Content</th><th>PDF Count</th><th>Present In</th></tr>")
+            for i, hash_value in enumerate(common_hashes):
+                file.write(f"<tr><td>Paragraph {i + 1}</td><td>{paragraph_texts[hash_value]}</td><td>{document_frequency[i]}</td>"
+                           f"<td>{document_frequency[i]} of {pdf_count} PDFs</td></tr>")
+            file.write("</table>")
+
+            file.write("<h1>Document Frequency</h1>")
+            file.write("<table border='1'><tr><th>Present In</th><th>Paragraphs</th></tr>")
+            for bucket, paragraph_count in frequency_buckets:
+                file.write(f"<tr><td>{bucket}</td><td>{paragraph_count}</td></tr>")
+            file.write("</table>")
+
+            file.write("<h1>Matrix</h1>")
+            file.write("<table border='1'><tr><th>PDF</th>")
+            for i in range(len(common_hashes)):
+                file.write(f"<th>Paragraph {i + 1}</th>")
+            file.write("</tr>")
+            for row in matrix.iter_rows():
+                file.write("<tr>" + "".join([f"<td>{cell}</td>" for cell in row]) + "</tr>")
+            file.write("</table>")
+            file.write("</body></html>")
+
+        logging.info(f"HTML Results are saved in the file: {output_html_file}")
+
+
+def sort_words(paragraph):
+    return ' '.join(sorted(paragraph.split()))
+
+
+def tokenize_paragraphs(paragraphs):
+    # Words are interned once per corpus. The vocabulary is sorted, so ascending ids follow the sort_words order
+    # and each paragraph becomes its distinct token ids (ascending) with their counts.
+    split_paragraphs = [paragraph.split() for paragraph in paragraphs]
+    vocabulary = sorted({word for words in split_paragraphs for word in words})
+    word_ids = {word: token_id for token_id, word in enumerate(vocabulary)}
+    tokens = []
+    for words in split_paragraphs:
+        token_ids = np.fromiter((word_ids[word] for word in words), dtype=np.uint32, count=len(words))
+        unique_ids, counts = np.unique(token_ids, return_counts=True)
+        tokens.append((unique_ids, counts.astype(np.uint32)))
+    logging.info(f"Tokenized {len(paragraphs)} paragraphs with a vocabulary of {len(vocabulary)} words.")
+    return tokens
+
+
+def shared_token_count(tokens_a, tokens_b):
+    # Size of the multiset intersection, which is the number of matching elements SequenceMatcher finds
+    # between two sorted sequences
+    ids_a, counts_a = tokens_a
+    ids_b, counts_b = tokens_b
+    _, index_a, index_b = np.intersect1d(ids_a, ids_b, assume_unique=True, return_indices=True)
+    return int(np.minimum(counts_a[index_a], counts_b[index_b]).sum())
+
+
+def document_term_matrix(tokens, scorer):
+    # CSR paragraphs x vocabulary: L2 normalised term counts for Cosine, term presence for Jaccard
+    if not tokens:
+        # No paragraphs to concatenate, e.g. when every PDF was empty or failed
+        return sparse.csr_matrix((0, 0), dtype=np.float64)
+    indptr = np.zeros(len(tokens) + 1, dtype=np.int64)
+    np.cumsum([len(ids) for ids, _ in tokens], out=indptr[1:])
+    indices = np.concatenate([ids for ids, _ in tokens]).astype(np.int32)
+    if scorer == "Cosine":
+        data = np.concatenate([counts for _, counts in tokens]).astype(np.float64)
+        data /= np.repeat(np.sqrt(np.add.reduceat(data * data, indptr[:-1])), np.diff(indptr))
+    else:
+        data = np.ones(len(indices), dtype=np.float64)
+    return sparse.csr_matrix((data, indices, indptr), shape=(len(tokens), int(indices.max()) + 1))
+
+
+def iter_sparse_similarity_blocks(tokens, scorer, start_row=0, lower_only=True):
+    # Yields (rows, columns, scores) of one block of rows at a time from the sparse product of the
+    # document-term matrix with its transpose, only cells that share at least one word are present
+    if sparse is None:
+        raise RuntimeError(f"The {scorer} scorer requires SciPy.")
+    matrix = document_term_matrix(tokens, scorer)
+    term_counts = np.diff(matrix.indptr)
+    count = matrix.shape[0]
+    block_rows = max(1, SPARSE_BLOCK_CELLS // max(count, 1))
+    for start in range(start_row, count, block_rows):
+        stop = min(start + block_rows, count)
+        product = (matrix[start:stop] @ matrix[:stop if lower_only else count].T).tocoo()
+        rows = product.row.astype(np.int64) + start
+        columns = product.col.astype(np.int64)
+        values = product.data
+        if scorer == "Jaccard":
+            values = values / (term_counts[rows] + term_counts[columns] - values)
+        yield rows, columns, np.round(values * 100, 2)
+
+
+def document_codes(document_ids):
+    # Integer form of single_document_ids, -1 for paragraphs found in several PDFs
+    codes = {}
+    return np.array([-1 if document_id is None else codes.setdefault(document_id, len(codes))
+                     for document_id in document_ids], dtype=np.int64)
+
+
+def sparse_similarity_pairs(tokens, similarity_threshold, scorer, start_row=0, document_ids=None):
+    codes = document_codes(document_ids) if document_ids is not None else None
+    for rows, columns, scores in iter_sparse_similarity_blocks(tokens, scorer, start_row):
+        keep = (columns < rows) & (scores >= similarity_threshold)
+        if codes is not None:
+            keep &= (codes[rows] < 0) | (codes[rows] != codes[columns])
+        yield from zip(columns[keep].tolist(), rows[keep].tolist(), scores[keep].tolist())
+
+
+def sparse_top_k_neighbours(tokens, document_ids, top_k, scorer):
+    codes = document_codes(document_ids)
+    neighbours = [[] for _ in tokens]
+    for rows, columns, scores in iter_sparse_similarity_blocks(tokens, scorer, lower_only=False):
+        keep = (columns != rows) & ((codes[rows] < 0) | (codes[rows] != codes[columns]))
+        if not keep.any():
+            continue
+        # Best score first and the lowest paragraph index on ties, then the first k entries of every row
+        order = np.lexsort((columns[keep], -scores[keep], rows[keep]))
+        rows, columns, scores = rows[keep][order], columns[keep][order], scores[keep][order]
+        row_starts = np.r_[0, np.flatnonzero(np.diff(rows)) + 1]
+        row_stops = np.r_[row_starts[1:], len(rows)]
+        for row_start, row_stop in zip(row_starts.tolist(), row_stops.tolist()):
+            row_stop = min(row_stop, row_start + top_k)
+            neighbours[int(rows[row_start])] = list(zip(columns[row_start:row_stop].tolist(),
+                                                        scores[row_start:row_stop].tolist()))
+    return neighbours
+
+
+# Scores paragraph pairs against one threshold, reusing and recording exact scores when a score cache is given.
+# With document ids, pairs of paragraphs found only in the same PDF are skipped.
+# With tokens, the ratio is taken over sorted words instead of the characters of the sorted paragraphs.
+class PairScorer:
+    def __init__(self, sorted_paragraphs, similarity_threshold, pair_keys=None, score_cache=None, document_ids=None,
+                 tokens=None):
+        self.sorted_paragraphs = sorted_paragraphs
+        self.similarity_threshold = similarity_threshold
+        # ratio() depends on which paragraph is the first sequence, so character rows follow the order of the
+        # paragraph keys: the paragraph of the larger key is the second sequence, whatever the order of this run
+        if tokens is None:
+            if pair_keys is None:
+                pair_keys = [SimilarityScoreCache.paragraph_key(paragraph) for paragraph in sorted_paragraphs]
+            self.order = sorted(range(len(sorted_paragraphs)), key=pair_keys.__getitem__)
+            self.ranks = [0] * len(sorted_paragraphs)
+            for rank, index in enumerate(self.order):
+                self.ranks[index] = rank
+        else:
+            self.order = self.ranks = range(len(sorted_paragraphs))
+        self.pair_keys = pair_keys
+        # Cached scores are read one row at a time, no process holds a copy of the whole cache. Rows are
+        # only looked up when the cache holds pairs between these paragraphs
+        self.record_scores = score_cache is not None
+        self.cached_pairs = score_cache.touch(pair_keys) if score_cache is not None else 0
+        self.cache_location = (score_cache.db_path, score_cache.table) if self.cached_pairs else None
+        self.cache_connection = None
+        self.row_scores = {}
+        self.document_ids = document_ids
+        self.tokens = tokens
+        if tokens is None:
+            self.lengths = [len(paragraph) for paragraph in sorted_paragraphs]
+        else:
+            self.lengths = [int(counts.sum()) for _, counts in tokens]
+        self.new_scores = {}
+
+    def load_row_scores(self, j):
+        # Cached scores of every pair with paragraph j, through a connection of this process
+        db_path, table = self.cache_location
+        if self.cache_connection is None:
+            self.cache_connection = sqlite3.connect(db_path, timeout=30)
+        key = self.pair_keys[j]
+        rows = self.cache_connection.execute(f"SELECT fingerprint_a, fingerprint_b, score FROM {table} "
+                                             "WHERE fingerprint_a = ? UNION ALL "
+                                             f"SELECT fingerprint_a, fingerprint_b, score FROM {table} "
+                                             "WHERE fingerprint_b = ?", (key, key))
+        return {(key_a, key_b): score for key_a, key_b, score in rows}
+
+    def key_ordered_pairs(self, candidates):
+        # Candidate pairs (i, j) turned so that paragraph j comes later in the key order
+        ranks = self.ranks
+        return [(i, j) if ranks[i] < ranks[j] else (j, i) for i, j in candidates]
+
+    def row_matcher(self, matcher, j):
+        if self.tokens is None:
+            if matcher is None:
+                matcher = SequenceMatcher(None)
+            matcher.set_seq2(self.sorted_paragraphs[j])
+        return matcher
+
+    def score_rows(self, rows):
+        # Each row is (j, candidates before j in the key order); paragraph j stays the cached second sequence
+        # of the matcher. Pairs come out as (i, j, score) with i < j
+        matcher = None
+        document_ids = self.document_ids
+        try:
+            for j, candidates in rows:
+                if self.cache_location is not None:
+                    self.row_scores = self.load_row_scores(j)
+                matcher = self.row_matcher(matcher, j)
+                document_id = document_ids[j] if document_ids is not None else None
+                for i in candidates:
+                    if document_id is not None and document_ids[i] == document_id:
+                        continue
+                    score = self.score_pair(matcher, i, j)
+                    if score is not None:
+                        yield (i, j, score) if i < j else (j, i, score)
+        finally:
+            if self.cache_connection is not None:
+                self.cache_connection.close()
+                self.cache_connection = None
+
+    def score_pair(self, matcher, i, j):
+        # Cheapest upper bounds first: the length ratio (real_quick_ratio), then shared characters (quick_ratio)
+        length_a = self.lengths[i]
+        length_b = self.lengths[j]
+        total_length = length_a + length_b
+        if total_length and round(2.0 * min(length_a, length_b) / total_length * 100, 2) < self.similarity_threshold:
+            return None
+
+        cache_key = None
+        if self.record_scores:
+            key_a, key_b = self.pair_keys[i], self.pair_keys[j]
+            cache_key = (key_a, key_b) if key_a < key_b else (key_b, key_a)
+            score = self.row_scores.get(cache_key)
+            if score is not None:
+                return score if score >= self.similarity_threshold else None
+
+        if self.tokens is not None:
+            # Sorted sequences have no crossing matches, so their ratio equals the shared-token bound
+            shared = shared_token_count(self.tokens[i], self.tokens[j])
+            score = round(2.0 * shared / total_length * 100, 2) if total_length else 100.0
+        else:
+            matcher.set_seq1(self.sorted_paragraphs[i])
+            if round(matcher.quick_ratio() * 100, 2) < self.similarity_threshold:
+                return None
+            score = round(matcher.ratio() * 100, 2)
+        if cache_key is not None:
+            self.new_scores[cache_key] = score
+        return score if score >= self.similarity_threshold else None
+
+
+def upper_triangle_rows(order, start_row=0, start=0, stop=None):
+    # Row p pairs paragraph order[p] with every paragraph before it in the order, keeping only the pairs
+    # with a paragraph from start_row on
+    new_positions = [position for position, index in enumerate(order) if index >= start_row]
+    for position in range(start, len(order) if stop is None else stop):
+        j = order[position]
+        if j >= start_row:
+            yield j, order[:position]
+        elif new_positions and new_positions[0] < position:
+            yield j, [order[p] for p in new_positions[:bisect_left(new_positions, position)]]
+
+
+# SQLite store of exact pair scores keyed by fingerprints of the sorted paragraphs, valid for any threshold
+class SimilarityScoreCache:
+    def __init__(self, db_path=SIMILARITY_CACHE_FILE, max_pairs=SIMILARITY_CACHE_MAX_PAIRS, table="pair_scores"):
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.db_path = db_path
+        self.max_pairs = max_pairs
+        self.table = table
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        with self.connection:
+            self.connection.execute(f"CREATE TABLE IF NOT EXISTS {table} (fingerprint_a INTEGER, fingerprint_b INTEGER, "
+                                    "score REAL, last_used REAL, PRIMARY KEY (fingerprint_a, fingerprint_b)) WITHOUT ROWID")
+            self.connection.execute(f"CREATE INDEX IF NOT EXISTS {table}_last_used ON {table} (last_used)")
+            self.connection.execute(f"CREATE INDEX IF NOT EXISTS {table}_fingerprint_b ON {table} (fingerprint_b)")
+
+    @staticmethod
+    def paragraph_key(sorted_paragraph):
+        return int.from_bytes(hashlib.blake2b(sorted_paragraph.encode('utf-8'), digest_size=8).digest(), 'big', signed=True)
+
+    def touch(self, keys):
+        # Marks every cached pair between the given paragraphs as used by this run, returns how many there are
+        current_pairs = ("fingerprint_a IN (SELECT fingerprint FROM current_keys) "
+                         "AND fingerprint_b IN (SELECT fingerprint FROM current_keys)")
+        with self.lock, self.connection:
+            self.connection.execute("CREATE TEMP TABLE IF NOT EXISTS current_keys (fingerprint INTEGER PRIMARY KEY)")
+            self.connection.execute("DELETE FROM current_keys")
+            self.connection.executemany("INSERT OR IGNORE INTO current_keys VALUES (?)", ((key,) for key in keys))
+            return self.connection.execute(f"UPDATE {self.table} SET last_used = ? WHERE {current_pairs}",
+                                           (time.time(),)).rowcount
+
+    def store(self, new_scores):
+        now = time.time()
+        with self.lock, self.connection:
+            self.connection.executemany(f"INSERT OR REPLACE INTO {self.table} VALUES (?, ?, ?, ?)",
+                                        ((key_a, key_b, score, now) for (key_a, key_b), score in new_scores.items()))
+            excess = self.connection.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0] - self.max_pairs
+            if excess > 0:
+                self.connection.execute(f"DELETE FROM {self.table} WHERE (fingerprint_a, fingerprint_b) IN ("
+                                        f"SELECT fingerprint_a, fingerprint_b FROM {self.table} ORDER BY last_used LIMIT ?)",
+                                        (excess,))
+                logging.info(f"Evicted {excess} pairs from the similarity score cache.")
+
+
+# Scores of each scorer are kept apart, character and word ratios of the same pair differ
+SIMILARITY_CACHE_TABLES = {"Characters": "pair_scores", "Words": "word_pair_scores"}
+_similarity_score_caches = {}
+
+
+def get_similarity_score_cache(scorer="Characters"):
+    # Sparse scorers compute whole blocks at once and are not cached
+    if scorer not in SIMILARITY_CACHE_TABLES:
+        return None
+    score_cache = _similarity_score_caches.get(scorer)
+    if score_cache is None:
+        score_cache = _similarity_score_caches[scorer] = SimilarityScoreCache(table=SIMILARITY_CACHE_TABLES[scorer])
+    return score_cache
+
+
+def word_shingles(sorted_paragraph, shingle_size=LSH_SHINGLE_SIZE):
+    words = sorted_paragraph.split()
+    if len(words) <= shingle_size:
+        return {' '.join(words)}
+    return {' '.join(words[k:k + shingle_size]) for k in range(len(words) - shingle_size + 1)}
+
+
+def minhash_signatures(sorted_paragraphs, permutation_count, seed=1):
+    # One universal hash (a * x + b) mod p per permutation, applied to CRC32s of the word shingles
+    generator = np.random.default_rng(seed)
+    a = generator.integers(1, MINHASH_PRIME, size=(permutation_count, 1), dtype=np.uint64)
+    b = generator.integers(0, MINHASH_PRIME, size=(permutation_count, 1), dtype=np.uint64)
+    signatures = np.empty((len(sorted_paragraphs), permutation_count), dtype=np.uint64)
+    for index, paragraph in enumerate(sorted_paragraphs):
+        shingle_hashes = np.fromiter((zlib.crc32(shingle.encode('utf-8')) for shingle in word_shingles(paragraph)),
+                                     dtype=np.uint64) % np.uint64(MINHASH_PRIME)
+        signatures[index] = ((a * shingle_hashes + b) % np.uint64(MINHASH_PRIME)).min(axis=1)
+    return signatures
+
+
+def lsh_candidate_pairs(sorted_paragraphs, bands=LSH_BANDS, rows_per_band=LSH_ROWS_PER_BAND):
+    # Paragraphs sharing every MinHash value of at least one band become a candidate pair (i, j) with i < j
+    signatures = minhash_signatures(sorted_paragraphs, bands * rows_per_band)
+    candidates = set()
+    for band in range(bands):
+        buckets = {}
+        band_signatures = signatures[:, band * rows_per_band:(band + 1) * rows_per_band]
+        for index, band_signature in enumerate(band_signatures):
+            buckets.setdefault(band_signature.tobytes(), []).append(index)
+        for members in buckets.values():
+            for position, j in enumerate(members):
+                for i in members[:position]:
+                    candidates.add((i, j))
+    return candidates
+
+
+def candidate_rows(candidates):
+    rows = {}
+    for i, j in candidates:
+        rows.setdefault(j, []).append(i)
+    for j in sorted(rows):
+        yield j, sorted(rows[j])
+
+
+def triangle_row_blocks(order, block_count, start_row=0):
+    # Row p holds p pairs, or as many as there are new paragraphs before it, so blocks further down the
+    # triangle span fewer rows for the same work
+    count = len(order)
+    target = max(1, (count * (count - 1) - start_row * (start_row - 1)) // 2 // block_count)
+    blocks = []
+    start = 0
+    work = 0
+    new_before = 0
+    for position, index in enumerate(order):
+        if index >= start_row:
+            work += position
+            new_before += 1
+        else:
+            work += new_before
+        if work >= target:
+            blocks.append((start, position + 1, start_row))
+            start = position + 1
+            work = 0
+    if start < count and start_row < count:
+        blocks.append((start, count, start_row))
+    return blocks
+
+
+def candidate_row_blocks(candidates, block_count):
+    target = max(1, len(candidates) // block_count)
+    block = []
+    work = 0
+    for row in candidate_rows(candidates):
+        block.append(row)
+        work += len(row[1])
+        if work >= target:
+            yield block
+            block = []
+            work = 0
+    if block:
+        yield block
+
+
+_pair_scorer = None
+
+
+def init_similarity_worker(pair_scorer):
+    # The sorted paragraphs are shipped once per worker instead of once per block, each worker
+    # reads the cached scores it needs through its own database connection
+    global _pair_scorer
+    _pair_scorer = pair_scorer
+
+
+def finish_similarity_block(pairs):
+    new_scores, _pair_scorer.new_scores = _pair_scorer.new_scores, {}
+    return pairs, new_scores
+
+
+def score_triangle_block(block):
+    start, stop, start_row = block
+    rows = upper_triangle_rows(_pair_scorer.order, start_row, start, stop)
+    return finish_similarity_block(list(_pair_scorer.score_rows(rows)))
+
+
+def score_candidate_block(rows):
+    return finish_similarity_block(list(_pair_scorer.score_rows(rows)))
+
+
+def iter_similar_pairs(pair_scorer, candidates=None, processes=None, start_row=0):
+    # Yields (i, j, score) for i < j at or above the threshold, only those pairs and newly
+    # computed cache entries come back from the workers. Only pairs with a paragraph from start_row on are scored.
+    count = len(pair_scorer.sorted_paragraphs)
+    if candidates is not None:
+        candidates = pair_scorer.key_ordered_pairs(candidates)
+    processes = processes or cpu_count()
+    if processes < 2 or count < PARALLEL_SIMILARITY_MIN_PARAGRAPHS:
+        rows = upper_triangle_rows(pair_scorer.order, start_row) if candidates is None else candidate_rows(candidates)
+        yield from pair_scorer.score_rows(rows)
+        return
+
+    block_count = processes * SIMILARITY_BLOCKS_PER_WORKER
+    with Pool(processes=processes, initializer=init_similarity_worker, initargs=(pair_scorer,)) as pool:
+        if candidates is None:
+            results = pool.imap_unordered(score_triangle_block,
+                                          triangle_row_blocks(pair_scorer.order, block_count, start_row))
+        else:
+            results = pool.imap_unordered(score_candidate_block, candidate_row_blocks(candidates, block_count))
+        for block_pairs, new_scores in results:
+            pair_scorer.new_scores.update(new_scores)
+            yield from block_pairs
+
+
+def collapse_duplicate_paragraphs(documents, pdf_names, fingerprint=DEFAULT_FINGERPRINT):
+    # Identical paragraphs are scored once; each unique paragraph keeps its (page, ordinal) locations per PDF
+    fingerprint_function = FINGERPRINT_FUNCTIONS[fingerprint]
+    unique_indexes = {}
+    unique_paragraphs = []
+    occurrences = []
+    for pdf_name, document in zip(pdf_names, documents):
+        for ordinal, (paragraph, page) in enumerate(zip(document.paragraphs, document.pages), start=1):
+            hash_value = fingerprint_function(paragraph.encode('utf-8'))
+            index = unique_indexes.get(hash_value)
+            if index is None:
+                index = unique_indexes[hash_value] = len(unique_paragraphs)
+                unique_paragraphs.append(paragraph)
+                occurrences.append({})
+            occurrences[index].setdefault(pdf_name, []).append((page, ordinal))
+    return unique_paragraphs, occurrences
+
+
+def occurrence_count(occurrence):
+    return sum(len(locations) for locations in occurrence.values())
+
+
+def format_occurrences(occurrence):
+    return "; ".join(f"{pdf_name} " + ", ".join(f"p{page} #{ordinal}" for page, ordinal in locations)
+                     for pdf_name, locations in occurrence.items())
+
+
+def single_document_ids(occurrences):
+    # The only PDF a paragraph occurs in, or None when it occurs in several
+    return [next(iter(occurrence)) if len(occurrence) == 1 else None for occurrence in occurrences]
+
+
+def same_document_pair_count(document_ids):
+    paragraph_counts = {}
+    for document_id in document_ids:
+        if document_id is not None:
+            paragraph_counts[document_id] = paragraph_counts.get(document_id, 0) + 1
+    return sum(count * (count - 1) // 2 for count in paragraph_counts.values())
+
+
+def calculate_similarity_pairs(paragraphs, similarity_threshold=0, use_lsh=False, score_cache=None, start_row=0,
+                               occurrences=None, scorer="Characters"):
+    # Generator of (i, j, score) above the threshold, memory stays proportional to the matching pairs.
+    # With start_row only pairs involving paragraphs from that index on are scored.
+    # With occurrences only pairs from different PDFs are scored.
+    sorted_paragraphs = [sort_words(x) for x in paragraphs]
+    count = len(sorted_paragraphs)
+    tokens = tokenize_paragraphs(paragraphs) if scorer != "Characters" else None
+    document_ids = None
+    if occurrences is not None:
+        document_ids = single_document_ids(occurrences)
+        logging.info(f"Cross-document scope skips {same_document_pair_count(document_ids)} of "
+                     f"{count * (count - 1) // 2} paragraph pairs.")
+    if scorer in SPARSE_SCORERS:
+        yield from sparse_similarity_pairs(tokens, similarity_threshold, scorer, start_row, document_ids)
+        return
+    if use_lsh:
+        candidates = {(i, j) for i, j in lsh_candidate_pairs(sorted_paragraphs) if j >= start_row}
+        logging.warning(f"LSH proposed {len(candidates)} of {count * (count - 1) // 2} paragraph pairs for scoring; "
+                        "results are approximate.")
+    else:
+        candidates = None
+
+    if score_cache is None:
+        pair_scorer = PairScorer(sorted_paragraphs, similarity_threshold, document_ids=document_ids, tokens=tokens)
+        yield from iter_similar_pairs(pair_scorer, candidates, start_row=start_row)
+        return
+    pair_keys = [score_cache.paragraph_key(paragraph) for paragraph in sorted_paragraphs]
+    pair_scorer = PairScorer(sorted_paragraphs, similarity_threshold, pair_keys, score_cache,
+                             document_ids, tokens)
+    yield from iter_similar_pairs(pair_scorer, candidates, start_row=start_row)
+    logging.info(f"Found {pair_scorer.cached_pairs} cached pair scores, "
+                 f"scored {len(pair_scorer.new_scores)} new pairs.")
+    score_cache.store(pair_scorer.new_scores)
+
+
+def pdf_input_folder(pdf_paths):
+    return os.path.normcase(os.path.dirname(os.path.abspath(pdf_paths[0]))) if pdf_paths else None
+
+
+def load_similarity_state(state_path, input_folder, min_char_count, similarity_threshold, cross_document=False,
+                          scorer="Characters"):
+    try:
+        with gzip.open(state_path, 'rt', encoding='utf-8') as file:
+            state = json.load(file)
+    except (OSError, ValueError):
+        logging.info(f"No previous percentage match state found at {state_path}, running a full comparison.")
+        return None
+    # An output folder can be shared by several input folders, their paragraphs and pairs must not mix
+    if state.get("input_folder") != input_folder:
+        logging.info("Previous percentage match state was made from another input folder, running a full comparison.")
+        return None
+    if (state.get("version"), state.get("min_char_count"), state.get("similarity_threshold"),
+            state.get("cross_document"), state.get("scorer", "Characters")) != \
+            (SIMILARITY_STATE_VERSION, min_char_count, similarity_threshold, cross_document, scorer):
+        logging.info("Previous percentage match state used different settings, running a full comparison.")
+        return None
+    return state
+
+
+def save_similarity_state(state_path, input_folder, min_char_count, similarity_threshold, paragraphs, occurrences,
+                          pairs, cross_document=False, scorer="Characters"):
+    state = {
+        "version": SIMILARITY_STATE_VERSION,
+        "input_folder": input_folder,
+        "min_char_count": min_char_count,
+        "similarity_threshold": similarity_threshold,
+        "cross_document": cross_document,
+        "scorer": scorer,
+        "paragraphs": paragraphs,
+        "sources": [sorted(occurrence) for occurrence in occurrences],
+        "pairs": pairs,
+    }
+    temporary_path = state_path + ".tmp"
+    with gzip.open(temporary_path, 'wt', encoding='utf-8') as file:
+        json.dump(state, file)
+    os.replace(temporary_path, state_path)
+
+
+def calculate_incremental_similarity_pairs(paragraphs, occurrences, previous_state, similarity_threshold,
+                                           score_cache=None, cross_document=False, scorer="Characters"):
+    # Paragraphs kept from the previous run come first, in their previous order, so their pairs carry over
+    # and only the rows of new paragraphs (new x existing and new x new) are scored.
+    # Cross-document pairs depend on the source PDFs, so paragraphs whose sources changed are scored again.
+    current_indexes = {paragraph: index for index, paragraph in enumerate(paragraphs)}
+    previous_to_current = {}
+    order = []
+    for previous_index, paragraph in enumerate(previous_state["paragraphs"]):
+        current_index = current_indexes.get(paragraph)
+        if current_index is not None and cross_document and \
+                sorted(occurrences[current_index]) != previous_state["sources"][previous_index]:
+            current_index = None
+        if current_index is not None:
+            del current_indexes[paragraph]
+            previous_to_current[previous_index] = len(order)
+            order.append(current_index)
+    existing_count = len(order)
+    order.extend(sorted(current_indexes.values()))
+
+    ordered_paragraphs = [paragraphs[index] for index in order]
+    ordered_occurrences = [occurrences[index] for index in order]
+    carried_pairs = [(previous_to_current[i], previous_to_current[j], score) for i, j, score in previous_state["pairs"]
+                     if i in previous_to_current and j in previous_to_current]
+    delta_pairs = sorted(calculate_similarity_pairs(ordered_paragraphs, similarity_threshold, score_cache=score_cache,
+                                                    start_row=existing_count,
+                                                    occurrences=ordered_occurrences if cross_document else None,
+                                                    scorer=scorer))
+    logging.info(f"Incremental percentage match: {len(paragraphs) - existing_count} new or moved paragraphs, "
+                 f"{len(previous_state['paragraphs']) - existing_count} removed, {len(delta_pairs)} new matching pairs.")
+    return ordered_paragraphs, ordered_occurrences, sorted(carried_pairs + delta_pairs), delta_pairs
+
+
+def cluster_similar_paragraphs(count, pairs, occurrences):
+    # Connected components of the thresholded pairs (union-find by size with path halving).
+    # The canonical paragraph is the most repeated one, then the best connected one.
+    parent = list(range(count))
+    size = [1] * count
+    weights = [0.0] * count
+
+    def find(index):
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    for i, j, score in pairs:
+        weights[i] += score
+        weights[j] += score
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            if size[root_i] < size[root_j]:
+                root_i, root_j = root_j, root_i
+            parent[root_j] = root_i
+            size[root_i] += size[root_j]
+
+    members_by_root = {}
+    for index in range(count):
+        members_by_root.setdefault(find(index), []).append(index)
+
+    clusters = []
+    for members in members_by_root.values():
+        if len(members) > 1:
+            canonical = max(members, key=lambda index: (occurrence_count(occurrences[index]), weights[index], -index))
+            clusters.append((canonical, members))
+    clusters.sort(key=lambda cluster: (-len(cluster[1]), cluster[1][0]))
+    return clusters
+
+
+def calculate_top_k_neighbours(paragraphs, occurrences, top_k, use_lsh=False, scorer="Characters"):
+    # Each paragraph keeps a min-heap of its k best (score, -index) matches from other PDFs. The scorer threshold
+    # follows the weakest entry of both full heaps, so its upper bounds skip pairs that cannot enter either heap.
+    document_ids = single_document_ids(occurrences)
+    tokens = tokenize_paragraphs(paragraphs) if scorer != "Characters" else None
+    if scorer in SPARSE_SCORERS:
+        return sparse_top_k_neighbours(tokens, document_ids, top_k, scorer)
+
+    sorted_paragraphs = [sort_words(x) for x in paragraphs]
+    count = len(sorted_paragraphs)
+    pair_scorer = PairScorer(sorted_paragraphs, -1.0, tokens=tokens)
+    if use_lsh:
+        candidates = lsh_candidate_pairs(sorted_paragraphs)
+        logging.warning(f"LSH proposed {len(candidates)} of {count * (count - 1) // 2} paragraph pairs for scoring; "
+                        "results are approximate.")
+        rows = candidate_rows(pair_scorer.key_ordered_pairs(candidates))
+    else:
+        rows = upper_triangle_rows(pair_scorer.order)
+
+    heaps = [[] for _ in range(count)]
+    floors = [-1.0] * count
+    scored = pruned = 0
+
+    def offer(index, score, other):
+        heap = heaps[index]
+        entry = (score, -other)
+        if len(heap) < top_k:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+        else:
+            return
+        if len(heap) == top_k:
+            floors[index] = heap[0][0]
+
+    if top_k > 0:
+        matcher = None
+        for j, row_candidates in rows:
+            matcher = pair_scorer.row_matcher(matcher, j)
+            document_id = document_ids[j]
+            for i in row_candidates:
+                if document_id is not None and document_ids[i] == document_id:
+                    continue
+                pair_scorer.similarity_threshold = min(floors[i], floors[j])
+                score = pair_scorer.score_pair(matcher, i, j)
+                if score is None:
+                    pruned += 1
+                    continue
+                scored += 1
+                offer(i, score, j)
+                offer(j, score, i)
+
+    logging.info(f"Top-{top_k} percentage match kept {scored} candidate pairs, pruned {pruned} below the heap floors.")
+    return [[(-negative_index, score) for score, negative_index in sorted(heap, reverse=True)] for heap in heaps]
+
+
+def iter_similarity_rows(count, pairs):
+    # Dense matrix rows rebuilt one at a time from the sparse pairs, cells not scored are 0
+    neighbours = [[] for _ in range(count)]
+    for i, j, score in pairs:
+        neighbours[i].append((j, score))
+        neighbours[j].append((i, score))
+    for index in range(count):
+        row = [0.0] * count
+        row[index] = 100.0
+        for other, score in neighbours[index]:
+            row[other] = score
+        yield row
+
+
+def benchmark_lsh_recall(paragraphs, similarity_threshold, bands=LSH_BANDS, rows_per_band=LSH_ROWS_PER_BAND):
+    # Compares LSH candidate scoring against the exhaustive upper triangle
+    sorted_paragraphs = [sort_words(x) for x in paragraphs]
+    count = len(sorted_paragraphs)
+
+    start_time = time.time()
+    pair_scorer = PairScorer(sorted_paragraphs, similarity_threshold)
+    exact_pairs = {(i, j) for i, j, _ in pair_scorer.score_rows(upper_triangle_rows(pair_scorer.order))}
+    exhaustive_seconds = time.time() - start_time
+
+    start_time = time.time()
+    candidates = lsh_candidate_pairs(sorted_paragraphs, bands, rows_per_band)
+    lsh_rows = candidate_rows(pair_scorer.key_ordered_pairs(candidates))
+    lsh_pairs = {(i, j) for i, j, _ in pair_scorer.score_rows(lsh_rows)}
+    lsh_seconds = time.time() - start_time
+
+    return {
+        "paragraphs": count,
+        "bands": bands,
+        "rows_per_band": rows_per_band,
+        "total_pairs": count * (count - 1) // 2,
+        "candidate_pairs": len(candidates),
+        "exact_matches": len(exact_pairs),
+        "lsh_matches": len(lsh_pairs),
+        "recall": len(lsh_pairs & exact_pairs) / len(exact_pairs) if exact_pairs else 1.0,
+        "exhaustive_seconds": round(exhaustive_seconds, 2),
+        "lsh_seconds": round(lsh_seconds, 2),
+    }
+
+
+def write_similarity_excel(output_folder, filename_prefix, all_paragraphs, occurrences, similarity_threshold, pairs):
+    current_time = datetime.now()
+    format_time = current_time.strftime("%Y%m%d%H%M%S")
+    output_file = os.path.join(output_folder, f"{filename_prefix}_{format_time}.xlsx")
+
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet(title="Paragraphs")
+    sheet.append(["Paragraph ID", "Content", "Occurrences", "Source PDFs"])
+    for i, paragraph in enumerate(all_paragraphs):
+        clean_paragraph = re.sub(r'[\x00-\x1F\x7F-\x9F]', '', paragraph)
+        sheet.append([f"Paragraph {i + 1}", clean_paragraph, occurrence_count(occurrences[i]),
+                      format_occurrences(occurrences[i])])
+
+    new_sheet = workbook.create_sheet(title=f"Similarity Matrix (Above {similarity_threshold}%)")
+    header_row = ["Paragraph"] + [f"Paragraph {i + 1}" for i in range(len(all_paragraphs))]
+    new_sheet.append(header_row)
+
+    for row_idx, row in enumerate(iter_similarity_rows(len(all_paragraphs), pairs)):
+        if any(cell >= similarity_threshold for cell in row):
+            filtered_row = [cell if cell >= similarity_threshold else None for cell in row]
+            final_row = [f"Paragraph {row_idx + 1}"] + filtered_row
+            new_sheet.append(final_row)
+
+    workbook.save(output_file)
+    workbook.close()
+    logging.info(f"Results are saved in the file: {output_file}")
+
+
+def write_similarity_csv(output_folder, filename_prefix, all_paragraphs, occurrences, similarity_threshold, pairs):
+    current_time = datetime.now()
+    format_time = current_time.strftime("%Y%m%d%H%M%S")
+    output_csv_paragraphs = os.path.join(output_folder, f"{filename_prefix}_paragraphs_{format_time}.csv")
+    output_csv_matrix = os.path.join(output_folder, f"{filename_prefix}_matrix_{format_time}.csv")
+
+    # Write Paragraphs to CSV
+    with open(output_csv_paragraphs, mode='a', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(["Paragraph ID", "Content", "Occurrences", "Source PDFs"])
+        for i, paragraph in enumerate(all_paragraphs):
+            clean_paragraph = re.sub(r'[\x00-\x1F\x7F-\x9F]', '', paragraph)
+            writer.writerow([f"Paragraph {i + 1}", clean_paragraph, occurrence_count(occurrences[i]),
+                             format_occurrences(occurrences[i])])
+
+    # Write Similarity Matrix to CSV
+    with open(output_csv_matrix, mode='a', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        header_row = ["Paragraph"] + [f"Paragraph {i + 1}" for i in range(len(all_paragraphs))]
+        writer.writerow(header_row)
+        for row_idx, row in enumerate(iter_similarity_rows(len(all_paragraphs), pairs)):
+            if any(cell >= similarity_threshold for cell in row):
+                filtered_row = [cell if cell >= similarity_threshold else '' for cell in row]
+                writer.writerow([f"Paragraph {row_idx + 1}"] + filtered_row)
+
+    logging.info(f"CSV Results are saved in the files: {output_csv_paragraphs}, {output_csv_matrix}")
+
+
+def write_similarity_html(output_folder, filename_prefix, all_paragraphs, occurrences, similarity_threshold, pairs):
+    current_time = datetime.now()
+    format_time = current_time.strftime("%Y%m%d%H%M%S")
+    output_html_file = os.path.join(output_folder, f"{filename_prefix}_{format_time}.html")
+
+    with open(output_html_file, 'w', encoding='utf-8') as file:
+        file.write("<html><head><title>Similarity Report</title></head><body>")
+        file.write("<h1>Paragraphs</h1>")
+        file.write("<table border='1'><tr><th>Paragraph ID</th><th>Content</th><th>Occurrences</th><th>Source PDFs</th></tr>")
+        for i, paragraph in enumerate(all_paragraphs):
+            clean_paragraph = re.sub(r'[\x00-\x1F\x7F-\x9F]', '', paragraph)
+            file.write(f"<tr><td>Paragraph {i + 1}</td><td>{clean_paragraph}</td><td>{occurrence_count(occurrences[i])}</td>"
+                       f"<td>{format_occurrences(occurrences[i])}</td></tr>")
+        file.write("</table>")
+
+        file.write("<h1>Similarity Matrix (Above {similarity_threshold}%)</h1>")
+        file.write("<table border='1'><tr><th>Paragraph</th>")
+        for i in range(len(all_paragraphs)):
+            file.write(f"<th>Paragraph {i + 1}</th>")
+        file.write("</tr>")
+        for row_idx, row in enumerate(iter_similarity_rows(len(all_paragraphs), pairs)):
+            filtered_row = [f"<td>{cell}</td>" if cell >= similarity_threshold else "<td></td>" for cell in row]
+            if any(cell >= similarity_threshold for cell in row):
+                file.write(f"<tr><td>Paragraph {row_idx + 1}</td>" + "".join(filtered_row) + "</tr>")
+        file.write("</table>")
+        file.write("</body></html>")
+
+    logging.info(f"HTML Results are saved in the file: {output_html_file}")
+
+
+def write_similarity_pairs(output_folder, filename_prefix, all_paragraphs, occurrences, similarity_threshold, pairs,
+                           file_type):
+    # Sparse edge list: one line per matching pair instead of an N x N matrix
+    current_time = datetime.now()
+    format_time = current_time.strftime("%Y%m%d%H%M%S")
+    clean_paragraphs = (re.sub(r'[\x00-\x1F\x7F-\x9F]', '', paragraph) for paragraph in all_paragraphs)
+    paragraph_sources = [format_occurrences(occurrence) for occurrence in occurrences]
+    paragraph_header = ["Paragraph ID", "Content", "Occurrences", "Source PDFs"]
+    pair_header = ["Paragraph A", "Paragraph B", "Score", "Source PDFs A", "Source PDFs B"]
+    pair_rows = ([f"Paragraph {i + 1}", f"Paragraph {j + 1}", score, paragraph_sources[i], paragraph_sources[j]]
+                 for i, j, score in pairs)
+
+    if file_type == "excel":
+        output_file = os.path.join(output_folder, f"{filename_prefix}_{format_time}.xlsx")
+        workbook = openpyxl.Workbook(write_only=True)
+        sheet = workbook.create_sheet(title="Paragraphs")
+        sheet.append(paragraph_header)
+        for i, paragraph in enumerate(clean_paragraphs):
+            sheet.append([f"Paragraph {i + 1}", paragraph, occurrence_count(occurrences[i]), paragraph_sources[i]])
+
+        pair_sheet = workbook.create_sheet(title=f"Similar Pairs (Above {similarity_threshold}%)")
+        pair_sheet.append(pair_header)
+        for row in pair_rows:
+            pair_sheet.append(row)
+
+        workbook.save(output_file)
+        workbook.close()
+        logging.info(f"Results are saved in the file: {output_file}")
+    elif file_type == "csv":
+        output_csv_paragraphs = os.path.join(output_folder, f"{filename_prefix}_paragraphs_{format_time}.csv")
+        output_csv_pairs = os.path.join(output_folder, f"{filename_prefix}_pairs_{format_time}.csv")
+
+        with open(output_csv_paragraphs, mode='a', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(paragraph_header)
+            for i, paragraph in enumerate(clean_paragraphs):
+                writer.writerow([f"Paragraph {i + 1}", paragraph, occurrence_count(occurrences[i]), paragraph_sources[i]])
+
+        with open(output_csv_pairs, mode='a', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(pair_header)
+            writer.writerows(pair_rows)
+
+        logging.info(f"CSV Results are saved in the files: {output_csv_paragraphs}, {output_csv_pairs}")
+    elif file_type == "html":
+        output_html_file = os.path.join(output_folder, f"{filename_prefix}_{format_time}.html")
+        with open(output_html_file, 'w', encoding='utf-8') as file:
+            file.write("<html><head><title>Similarity Report</title></head><body>")
+            file.write("<h1>Paragraphs</h1>")
+            file.write("<table border='1'><tr>" + "".join(f"<th>{cell}</th>" for cell in paragraph_header) + "</tr>")
+            for i, paragraph in enumerate(clean_paragraphs):
+                file.write(f"<tr><td>Paragraph {i + 1}</td><td>{paragraph}</td><td>{occurrence_count(occurrences[i])}</td>"
+                           f"<td>{paragraph_sources[i]}</td></tr>")
+            file.write("</table>")
+
+            file.write(f"<h1>Similar Pairs (Above {similarity_threshold}%)</h1>")
+            file.write("<table border='1'><tr>" + "".join(f"<th>{cell}</th>" for cell in pair_header) + "</tr>")
+            for row in pair_rows:
+                file.write("<tr>" + "".join(f"<td>{cell}</td>" for cell in row) + "</tr>")
+            file.write("</table>")
+            file.write("</body></html>")
+
+        logging.info(f"HTML Results are saved in the file: {output_html_file}")
+
+
+def write_similarity_clusters(output_folder, filename_prefix, all_paragraphs, occurrences, similarity_threshold, pairs,
+                              file_type):
+    # One summary line per group of connected paragraphs, plus every member of every group
+    current_time = datetime.now()
+    format_time = current_time.strftime("%Y%m%d%H%M%S")
+    clusters = cluster_similar_paragraphs(len(all_paragraphs), pairs, occurrences)
+    logging.info(f"Grouped {sum(len(members) for _, members in clusters)} paragraphs into {len(clusters)} clusters.")
+
+    def clean(paragraph):
+        return re.sub(r'[\x00-\x1F\x7F-\x9F]', '', paragraph)
+
+    cluster_header = ["Cluster ID", "Size", "Canonical Paragraph", "Canonical Content", "Source PDFs"]
+    member_header = ["Cluster ID", "Paragraph ID", "Canonical", "Content", "Occurrences", "Source PDFs"]
+
+    def cluster_rows():
+        for cluster_index, (canonical, members) in enumerate(clusters):
+            source_pdfs = {}
+            for index in members:
+                for pdf_name, locations in occurrences[index].items():
+                    source_pdfs.setdefault(pdf_name, []).extend(locations)
+            yield [f"Cluster {cluster_index + 1}", len(members), f"Paragraph {canonical + 1}",
+                   clean(all_paragraphs[canonical]), format_occurrences(source_pdfs)]
+
+    def member_rows():
+        for cluster_index, (canonical, members) in enumerate(clusters):
+            for index in members:
+                yield [f"Cluster {cluster_index + 1}", f"Paragraph {index + 1}", "Yes" if index == canonical else "No",
+                       clean(all_paragraphs[index]), occurrence_count(occurrences[index]),
+                       format_occurrences(occurrences[index])]
+
+    if file_type == "excel":
+        output_file = os.path.join(output_folder, f"{filename_prefix}_{format_time}.xlsx")
+        workbook = openpyxl.Workbook(write_only=True)
+        sheet = workbook.create_sheet(title=f"Clusters (Above {similarity_threshold}%)")
+        sheet.append(cluster_header)
+        for row in cluster_rows():
+            sheet.append(row)
+
+        member_sheet = workbook.create_sheet(title="Cluster Members")
+        member_sheet.append(member_header)
+        for row in member_rows():
+            member_sheet.append(row)
+
+        workbook.save(output_file)
+        workbook.close()
+        logging.info(f"Results are saved in the file: {output_file}")
+    elif file_type == "csv":
+        output_csv_clusters = os.path.join(output_folder, f"{filename_prefix}_clusters_{format_time}.csv")
+        output_csv_members = os.path.join(output_folder, f"{filename_prefix}_members_{format_time}.csv")
+
+        with open(output_csv_clusters, mode='a', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(cluster_header)
+            writer.writerows(cluster_rows())
+
+        with open(output_csv_members, mode='a', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(member_header)
+            writer.writerows(member_rows())
+
+        logging.info(f"CSV Results are saved in the files: {output_csv_clusters}, {output_csv_members}")
+    elif file_type == "html":
+        output_html_file = os.path.join(output_folder, f"{filename_prefix}_{format_time}.html")
+        with open(output_html_file, 'w', encoding='utf-8') as file:
+            file.write("<html><head><title>Similarity Clusters</title></head><body>")
+            file.write(f"<h1>Clusters (Above {similarity_threshold}%)</h1>")
+            file.write("<table border='1'><tr>" + "".join(f"<th>{cell}</th>" for cell in cluster_header) + "</tr>")
+            for row in cluster_rows():
+                file.write("<tr>" + "".join(f"<td>{cell}</td>" for cell in row) + "</tr>")
+            file.write("</table>")
+
+            file.write("<h1>Cluster Members</h1>")
+            file.write("<table border='1'><tr>" + "".join(f"<th>{cell}</th>" for cell in member_header) + "</tr>")
+            for row in member_rows():
+                file.write("<tr>" + "".join(f"<td>{cell}</td>" for cell in row) + "</tr>")
+            file.write("</table>")
+            file.write("</body></html>")
+
+        logging.info(f"HTML Results are saved in the file: {output_html_file}")
+
+
+def write_similarity_top_k(output_folder, filename_prefix, all_paragraphs, occurrences, top_k, neighbours, file_type):
+    # One line per paragraph and rank, best match from another PDF first
+    current_time = datetime.now()
+    format_time = current_time.strftime("%Y%m%d%H%M%S")
+    clean_paragraphs = [re.sub(r'[\x00-\x1F\x7F-\x9F]', '', paragraph) for paragraph in all_paragraphs]
+    paragraph_sources = [format_occurrences(occurrence) for occurrence in occurrences]
+    paragraph_header = ["Paragraph ID", "Content", "Occurrences", "Source PDFs"]
+    match_header = ["Paragraph ID", "Rank", "Match ID", "Score", "Source PDFs", "Match Source PDFs", "Match Content"]
+
+    def match_rows():
+        for i, matches in enumerate(neighbours):
+            for rank, (j, score) in enumerate(matches):
+                yield [f"Paragraph {i + 1}", rank + 1, f"Paragraph {j + 1}", score, paragraph_sources[i],
+                       paragraph_sources[j], clean_paragraphs[j]]
+
+    if file_type == "excel":
+        output_file = os.path.join(output_folder, f"{filename_prefix}_{format_time}.xlsx")
+        workbook = openpyxl.Workbook(write_only=True)
+        sheet = workbook.create_sheet(title="Paragraphs")
+        sheet.append(paragraph_header)
+        for i, paragraph in enumerate(clean_paragraphs):
+            sheet.append([f"Paragraph {i + 1}", paragraph, occurrence_count(occurrences[i]), paragraph_sources[i]])
+
+        match_sheet = workbook.create_sheet(title=f"Top {top_k} Matches")
+        match_sheet.append(match_header)
+        for row in match_rows():
+            match_sheet.append(row)
+
+        workbook.save(output_file)
+        workbook.close()
+        logging.info(f"Results are saved in the file: {output_file}")
+    elif file_type == "csv":
+        output_csv_paragraphs = os.path.join(output_folder, f"{filename_prefix}_paragraphs_{format_time}.csv")
+        output_csv_matches = os.path.join(output_folder, f"{filename_prefix}_matches_{format_time}.csv")
+
+        with open(output_csv_paragraphs, mode='a', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(paragraph_header)
+            for i, paragraph in enumerate(clean_paragraphs):
+                writer.writerow([f"Paragraph {i + 1}", paragraph, occurrence_count(occurrences[i]), paragraph_sources[i]])
+
+        with open(output_csv_matches, mode='a', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(match_header)
+            writer.writerows(match_rows())
+
+        logging.info(f"CSV Results are saved in the files: {output_csv_paragraphs}, {output_csv_matches}")
+    elif file_type == "html":
+        output_html_file = os.path.join(output_folder, f"{filename_prefix}_{format_time}.html")
+        with open(output_html_file, 'w', encoding='utf-8') as file:
+            file.write("<html><head><title>Similarity Report</title></head><body>")
+            file.write("<h1>Paragraphs</h1>")
+            file.write("<table border='1'><tr>" + "".join(f"<th>{cell}</th>" for cell in paragraph_header) + "</tr>")
+            for i, paragraph in enumerate(clean_paragraphs):
+                file.write(f"<tr><td>Paragraph {i + 1}</td><td>{paragraph}</td><td>{occurrence_count(occurrences[i])}</td>"
+                           f"<td>{paragraph_sources[i]}</td></tr>")
+            file.write("</table>")
+
+            file.write(f"<h1>Top {top_k} Matches</h1>")
+            file.write("<table border='1'><tr>" + "".join(f"<th>{cell}</th>" for cell in match_header) + "</tr>")
+            for row in match_rows():
+                file.write("<tr>" + "".join(f"<td>{cell}</td>" for cell in row) + "</tr>")
+            file.write("</table>")
+            file.write("</body></html>")
+
+        logging.info(f"HTML Results are saved in the file: {output_html_file}")
+
+
+def write_similarity_report(output_folder, file_type, similarity_output, all_paragraphs, occurrences,
+                            similarity_threshold, pairs):
+    if similarity_output == "Pair List":
+        write_similarity_pairs(output_folder, "percentage_pairs", all_paragraphs, occurrences, similarity_threshold,
+                               pairs, file_type)
+    elif similarity_output == "Clusters":
+        write_similarity_clusters(output_folder, "percentage_clusters", all_paragraphs, occurrences,
+                                  similarity_threshold, pairs, file_type)
+    elif file_type == "excel":
+        write_similarity_excel(output_folder, "percentage_report", all_paragraphs, occurrences, similarity_threshold,
+                               pairs)
+    elif file_type == "csv":
+        write_similarity_csv(output_folder, "percentage_report", all_paragraphs, occurrences, similarity_threshold,
+                             pairs)
+    elif file_type == "html":
+        write_similarity_html(output_folder, "percentage_report", all_paragraphs, occurrences, similarity_threshold,
+                              pairs)
+
+
+def generate_similarity_reports(session, pdf_paths, output_folder, file_types, min_char_count, similarity_threshold,
+                                similarity_output="Matrix", scorer="Characters", cross_document=False,
+                                state_path=None, top_k=DEFAULT_TOP_K):
+    # Shared by the GUI buttons and the headless --report command
+    if similarity_output == "Top-k":
+        unique_paragraphs, occurrences, neighbours = session.get_top_k(pdf_paths, min_char_count, top_k, scorer)
+        for file_type in file_types:
+            write_similarity_top_k(output_folder, "percentage_top_k", unique_paragraphs, occurrences, top_k,
+                                   neighbours, file_type)
+        return
+
+    unique_paragraphs, occurrences, pairs, delta_pairs = session.get_similarity(
+        pdf_paths, min_char_count, similarity_threshold, state_path, cross_document, scorer)
+    for file_type in file_types:
+        write_similarity_report(output_folder, file_type, similarity_output, unique_paragraphs, occurrences,
+                                similarity_threshold, pairs)
+        if delta_pairs is not None:
+            write_similarity_pairs(output_folder, "percentage_delta", unique_paragraphs, occurrences,
+                                   similarity_threshold, delta_pairs, file_type)
+
+
+# Memoizes extracted paragraphs, the presence matrix and similarity results between report runs
+class AnalysisSession:
+    def __init__(self, pool_manager=None):
+        self.pool_manager = pool_manager
+        self.lock = threading.RLock()
+        self.extraction_key = None
+        self.documents = None
+        self.all_paragraphs = None
+        self.rationalization = None
+        self.similarity_key = None
+        self.similarity = None
+        self.top_k_key = None
+        self.top_k = None
+
+    @staticmethod
+    def get_folder_signature(pdf_paths):
+        signature = []
+        for pdf_path in pdf_paths:
+            file_stat = os.stat(pdf_path)
+            signature.append((pdf_path, file_stat.st_size, file_stat.st_mtime))
+        return tuple(signature)
+
+    def get_documents(self, pdf_paths, min_char_count):
+        with self.lock:
+            extraction_key = (self.get_folder_signature(pdf_paths), min_char_count)
+            if extraction_key != self.extraction_key:
+                self.documents = process_pdfs_in_parallel(pdf_paths, min_char_count, self.pool_manager)
+                self.all_paragraphs = [document.paragraphs for document in self.documents]
+                self.extraction_key = extraction_key
+                self.rationalization = None
+                self.similarity_key = None
+                self.similarity = None
+                self.top_k_key = None
+                self.top_k = None
+            else:
+                logging.info("Reusing extracted paragraphs from the current session.")
+            return self.documents
+
+    def get_paragraphs(self, pdf_paths, min_char_count):
+        with self.lock:
+            self.get_documents(pdf_paths, min_char_count)
+            return self.all_paragraphs
+
+    def get_rationalization(self, pdf_paths, min_char_count):
+        with self.lock:
+            all_paragraphs = self.get_paragraphs(pdf_paths, min_char_count)
+            if self.rationalization is None:
+                self.rationalization = generate_common_hashes_and_matrix(pdf_paths, all_paragraphs)
+            return self.rationalization
+
+    @staticmethod
+    def get_unique_paragraphs(pdf_paths, documents):
+        pdf_names = [os.path.basename(pdf_path) for pdf_path in pdf_paths]
+        unique_paragraphs, occurrences = collapse_duplicate_paragraphs(documents, pdf_names)
+        logging.info(f"Scoring {len(unique_paragraphs)} unique paragraphs out of "
+                     f"{sum(len(document.paragraphs) for document in documents)}.")
+        return unique_paragraphs, occurrences
+
+    def get_similarity(self, pdf_paths, min_char_count, similarity_threshold, state_path=None, cross_document=False,
+                       scorer="Characters"):
+        # With a state path the previous run stored there is updated incrementally, delta pairs are None otherwise
+        with self.lock:
+            documents = self.get_documents(pdf_paths, min_char_count)
+            similarity_key = (similarity_threshold, state_path, cross_document, scorer)
+            if similarity_key != self.similarity_key:
+                unique_paragraphs, occurrences = self.get_unique_paragraphs(pdf_paths, documents)
+                input_folder = pdf_input_folder(pdf_paths)
+                previous_state = None
+                if state_path is not None:
+                    previous_state = load_similarity_state(state_path, input_folder, min_char_count,
+                                                           similarity_threshold, cross_document, scorer)
+                if previous_state is None:
+                    pairs = sorted(calculate_similarity_pairs(unique_paragraphs, similarity_threshold,
+                                                              score_cache=get_similarity_score_cache(scorer),
+                                                              occurrences=occurrences if cross_document else None,
+                                                              scorer=scorer))
+                    delta_pairs = None
+                else:
+                    unique_paragraphs, occurrences, pairs, delta_pairs = calculate_incremental_similarity_pairs(
+                        unique_paragraphs, occurrences, previous_state, similarity_threshold,
+                        get_similarity_score_cache(scorer), cross_document, scorer)
+                if state_path is not None:
+                    save_similarity_state(state_path, input_folder, min_char_count, similarity_threshold,
+                                          unique_paragraphs, occurrences, pairs, cross_document, scorer)
+                self.similarity = unique_paragraphs, occurrences, pairs, delta_pairs
+                self.similarity_key = similarity_key
+            return self.similarity
+
+    def get_top_k(self, pdf_paths, min_char_count, top_k, scorer="Characters"):
+        with self.lock:
+            documents = self.get_documents(pdf_paths, min_char_count)
+            top_k_key = (top_k, scorer)
+            if top_k_key != self.top_k_key:
+                unique_paragraphs, occurrences = self.get_unique_paragraphs(pdf_paths, documents)
+                neighbours = calculate_top_k_neighbours(unique_paragraphs, occurrences, top_k, scorer=scorer)
+                self.top_k = unique_paragraphs, occurrences, neighbours
+                self.top_k_key = top_k_key
+            return self.top_k
+
+
+class PDFComparerApp:
+    def __init__(self, master):
+        self.master = master
+        master.title("PDF Comparer Tool")
+
+        # Variables to store input and output folder paths
+        self.input_folder_path = tk.StringVar()
+        self.output_folder_path = tk.StringVar()
+        self.min_char_count = tk.IntVar(value=100)  # Default minimum character count
+        self.similarity_threshold = tk.IntVar(value=90)  # Default similarity threshold percentage
+        self.similarity_output = tk.StringVar(value=SIMILARITY_OUTPUTS[0])  # Percentage match report layout
+        self.incremental_similarity = tk.BooleanVar(value=False)  # Update the previous run in the output folder
+        self.similarity_top_k = tk.IntVar(value=DEFAULT_TOP_K)  # Matches kept per paragraph in Top-k output
+        self.similarity_scope = tk.StringVar(value=SIMILARITY_SCOPES[0])  # Cross-Document skips same-PDF pairs
+        self.similarity_scorer = tk.StringVar(value=SIMILARITY_SCORERS[0])  # Words is much faster on long paragraphs
+
+        # Extraction workers stay alive between button clicks and are started in the background
+        self.pool_manager = ExtractionPoolManager()
+        threading.Thread(target=self.pool_manager.warm_up, daemon=True).start()
+        master.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        # Extraction and comparison results are reused until the folder or settings change
+        self.session = AnalysisSession(self.pool_manager)
+
+        # Create GUI elements
+        self.create_widgets()
+
+    def on_close(self):
+        self.pool_manager.terminate()
+        self.master.destroy()
+
+    def create_widgets(self):
+        # Tkinter widgets for the UI
+        self.configure_window()
+        self.create_heading_frame()
+        self.create_input_output_frames()
+        self.create_min_char_count_frame()
+        self.create_similarity_threshold_frame()
+        self.create_compare_buttons()
+
+    def configure_window(self):
+        screen_width = self.master.winfo_screenwidth()
+        screen_height = self.master.winfo_screenheight()
+        x_position = (screen_width - 1100) // 2
+        y_position = (screen_height - 680) // 2
+        self.master.geometry(f"1100x680+{x_position}+{y_position}")
+
+    def create_heading_frame(self):
+        heading_frame = tk.Frame(self.master, bg="#1a1a2e")
+        heading_frame.pack(fill=tk.X, pady=10, padx=10)
+
+        self.load_image(heading_frame, image1, "left")
+        heading_label = self.create_label(heading_frame, "Content Rationalizer", font=("Helvetica", 26, "bold"),
+                                          bg="#1a1a2e", fg="white")
+        heading_label.pack(side="left", expand=True)
+        self.load_image(heading_frame, image2, "right")
+
+    def load_image(self, frame, image_path, side):
+        try:
+            if os.path.exists(image_path):
+                original_image = Image.open(image_path).resize((80, 80), Image.LANCZOS)
+                photo = ImageTk.PhotoImage(original_image)
+                image_label = tk.Label(frame, image=photo, bg="#1a1a2e")
+                image_label.image = photo  # Keep reference to avoid garbage collection
+                image_label.pack(side=side, padx=10)
+            else:
+                raise FileNotFoundError(f"Image file not found: {image_path}")
+        except Exception as e:
+            logging.error(f"Error loading image: {str(e)}")
+
+    def create_input_output_frames(self):
+        self.create_folder_frame("Input Folder ", self.input_folder_path, self.browse_input_folder)
+        self.create_folder_frame("Output Folder ", self.output_folder_path, self.browse_output_folder)
+
+    def create_min_char_count_frame(self):
+        frame = tk.Frame(self.master)
+        frame.pack(pady=10)
+        self.create_label(frame, "Minimum Character Count for Rationalization and Percentage Reports: ", font=("Helvetica", 12)).pack(side=tk.LEFT)
+        self.create_entry(frame, textvariable=self.min_char_count, width=10).pack(side=tk.LEFT, padx=(5, 0))
+
+    def create_similarity_threshold_frame(self):
+        frame = tk.Frame(self.master)
+        frame.pack(pady=10)
+        self.create_label(frame, "Minimum Similarity Percentage for Percentage Match Reports Only: ", font=("Helvetica", 12)).pack(side=tk.LEFT)
+        self.create_entry(frame, textvariable=self.similarity_threshold, width=10).pack(side=tk.LEFT, padx=(5, 0))
+        tk.OptionMenu(frame, self.similarity_scorer, *SIMILARITY_SCORERS).pack(side=tk.LEFT)
+        self.create_label(frame, "Output: ", font=("Helvetica", 12)).pack(side=tk.LEFT, padx=(15, 0))
+        tk.OptionMenu(frame, self.similarity_output, *SIMILARITY_OUTPUTS).pack(side=tk.LEFT)
+        self.create_label(frame, "k: ", font=("Helvetica", 12)).pack(side=tk.LEFT, padx=(10, 0))
+        self.create_entry(frame, textvariable=self.similarity_top_k, width=4).pack(side=tk.LEFT)
+        tk.OptionMenu(frame, self.similarity_scope, *SIMILARITY_SCOPES).pack(side=tk.LEFT, padx=(10, 0))
+        tk.Checkbutton(frame, text="Incremental", variable=self.incremental_similarity,
+                       font=("Helvetica", 12)).pack(side=tk.LEFT, padx=(15, 0))
+
+    def create_folder_frame(self, label_text, path_variable, browse_command):
+        frame = tk.Frame(self.master)
+        frame.pack(pady=10)
+        self.create_label(frame, label_text, font=("Helvetica", 12)).pack(side=tk.LEFT)
+        self.create_entry(frame, textvariable=path_variable, width=50).pack(side=tk.LEFT, padx=(5, 0))
+        self.create_button(frame, "Browse", browse_command, font=("Helvetica", 10), width=10).pack(side=tk.LEFT,
+                                                                                                   padx=(10, 0))
+
+    def create_compare_buttons(self):
+        compare_frame = tk.Frame(self.master, bg="#1a1a2e")
+        compare_frame.pack(pady=20, padx=10, fill=tk.X)
+
+        button_texts = [
+            "Rationalise (Excel)",
+            "Rationalise (CSV)",
+            "Rationalise (HTML)",
+            "Percentage Match (Excel)",
+            "Percentage Match (CSV)",
+            "Percentage Match (HTML)"
+        ]
+
+        button_commands = [
+            self.compare_pdfs_excel,
+            self.compare_pdfs_csv,
+            self.compare_pdfs_html,
+            self.compare_similarity_excel,
+            self.compare_similarity_csv,
+            self.compare_similarity_html
+        ]
+
+        for i in range(len(button_texts)):
+            button = self.create_button(compare_frame, button_texts[i],
+                                        lambda cmd=button_commands[i]: threading.Thread(target=cmd, daemon=True).start(),
+                                        font=("Helvetica", 10, "bold"), width=25, height=2, bg="white")
+            button.grid(row=i // 3, column=i % 3, padx=10, pady=10, sticky='nsew')
+
+        all_formats_button = self.create_button(compare_frame, "Generate All Formats",
+                                                lambda: threading.Thread(target=self.generate_all_reports, daemon=True).start(),
+                                                font=("Helvetica", 10, "bold"), height=2, bg="white")
+        all_formats_button.grid(row=2, column=0, columnspan=3, padx=10, pady=10, sticky='nsew')
+
+        for i in range(3):
+            compare_frame.grid_columnconfigure(i, weight=1)
+
+    def create_label(self, frame, text, **kwargs):
+        return tk.Label(frame, text=text, **kwargs)
+
+    def create_entry(self, frame, textvariable, **kwargs):
+        return tk.Entry(frame, textvariable=textvariable, **kwargs)
+
+    def create_button(self, frame, text, command, **kwargs):
+        return tk.Button(frame, text=text, command=command, **kwargs)
+
+    def browse_input_folder(self):
+        folder_path = filedialog.askdirectory()
+        if folder_path:
+            self.input_folder_path.set(folder_path)
+
+    def browse_output_folder(self):
+        folder_path = filedialog.askdirectory()
+        if folder_path:
+            self.output_folder_path.set(folder_path)
+
+    def compare_pdfs_excel(self):
+        self.generate_reports(rationalization_formats=["excel"])
+
+    def compare_pdfs_csv(self):
+        self.generate_reports(rationalization_formats=["csv"])
+
+    def compare_pdfs_html(self):
+        self.generate_reports(rationalization_formats=["html"])
+
+    def compare_similarity_excel(self):
+        self.generate_reports(similarity_formats=["excel"])
+
+    def compare_similarity_csv(self):
+        self.generate_reports(similarity_formats=["csv"])
+
+    def compare_similarity_html(self):
+        self.generate_reports(similarity_formats=["html"])
+
+    def generate_all_reports(self):
+        self.generate_reports(REPORT_FORMATS, REPORT_FORMATS)
+
+    def generate_reports(self, rationalization_formats=(), similarity_formats=()):
+        input_folder, output_folder, pdf_paths = self.get_input_output_paths()
+        if not pdf_paths:
+            return
+
+        start_time = time.time()
+        logging.info(f"Total PDF files to process: {len(pdf_paths)}")
+        min_char_count = self.min_char_count.get()
+
+        if rationalization_formats:
+            try:
+                common_hashes, matrix, paragraph_texts = self.session.get_rationalization(pdf_paths, min_char_count)
+                for file_type in rationalization_formats:
+                    write_results(output_folder, "rationalized_result", common_hashes, matrix, paragraph_texts, file_type)
+            except Exception as e:
+                logging.error(f"Error during comparison: {str(e)}")
+
+        if similarity_formats:
+            try:
+                state_path = None
+                if self.incremental_similarity.get():
+                    state_path = os.path.join(output_folder, SIMILARITY_STATE_FILE)
+                generate_similarity_reports(self.session, pdf_paths, output_folder, similarity_formats, min_char_count,
+                                            self.similarity_threshold.get(), self.similarity_output.get(),
+                                            self.similarity_scorer.get(),
+                                            self.similarity_scope.get() == "Cross-Document", state_path,
+                                            self.similarity_top_k.get())
+            except Exception as e:
+                logging.error(f"Error during similarity comparison: {str(e)}")
+
+        self.log_processing_time(start_time)
+
+    def get_input_output_paths(self):
+        input_folder = self.input_folder_path.get()
+        output_folder = self.output_folder_path.get()
+
+        if not input_folder or not output_folder:
+            logging.error("Input and output folders must be selected.")
+            return None, None, None
+
+        pdf_paths = [os.path.join(input_folder, f) for f in os.listdir(input_folder) if f.endswith('.pdf')]
+        if not pdf_paths:
+            logging.error("No PDF files found in the input folder.")
+            return None, None, None
+
+        return input_folder, output_folder, pdf_paths
+
+    def log_processing_time(self, start_time):
+        end_time = time.time()
+        elapsed_time = end_time - start_time
+        logging.info(f"Processing completed in {elapsed_time:.2f} seconds.")
+
+
+def run_command_line(arguments):
+    parser = argparse.ArgumentParser(description="Content Rationalizer command line tools")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--benchmark-lsh", metavar="INPUT_FOLDER",
+                      help="Report LSH recall against exhaustive percentage match for the PDFs in a folder")
+    mode.add_argument("--report", metavar="INPUT_FOLDER",
+                      help="Write percentage match reports for the PDFs in a folder without the GUI")
+    parser.add_argument("--output", metavar="OUTPUT_FOLDER", help="Folder for --report files, the input folder by default")
+    parser.add_argument("--formats", nargs="+", choices=REPORT_FORMATS, default=REPORT_FORMATS)
+    parser.add_argument("--layout", choices=SIMILARITY_OUTPUTS, default=SIMILARITY_OUTPUTS[0])
+    parser.add_argument("--scorer", choices=SIMILARITY_SCORERS, default=SIMILARITY_SCORERS[0])
+    parser.add_argument("--cross-document", action="store_true")
+    parser.add_argument("--incremental", action="store_true")
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K)
+    parser.add_argument("--min-chars", type=int, default=100)
+    parser.add_argument("--threshold", type=int, default=90)
+    parser.add_argument("--bands", type=int, nargs="+", default=[LSH_BANDS])
+    parser.add_argument("--rows-per-band", type=int, nargs="+", default=[LSH_ROWS_PER_BAND])
+    args = parser.parse_args(arguments)
+
+    if args.report:
+        pdf_paths = [os.path.join(args.report, f) for f in os.listdir(args.report) if f.endswith('.pdf')]
+        if not pdf_paths:
+            logging.error("No PDF files found in the input folder.")
+            return
+        output_folder = args.output or args.report
+        os.makedirs(output_folder, exist_ok=True)
+        state_path = os.path.join(output_folder, SIMILARITY_STATE_FILE) if args.incremental else None
+        start_time = time.time()
+        with ExtractionPoolManager() as pool_manager:
+            generate_similarity_reports(AnalysisSession(pool_manager), pdf_paths, output_folder, args.formats,
+                                        args.min_chars, args.threshold, args.layout, args.scorer, args.cross_document,
+                                        state_path, args.top_k)
+        logging.info(f"Processing completed in {time.time() - start_time:.2f} seconds.")
+        return
+
+    pdf_paths = [os.path.join(args.benchmark_lsh, f) for f in os.listdir(args.benchmark_lsh) if f.endswith('.pdf')]
+    documents = process_pdfs_in_parallel(pdf_paths, args.min_chars)
+    unique_paragraphs, _ = collapse_duplicate_paragraphs(documents, pdf_paths)
+    for bands in args.bands:
+        for rows_per_band in args.rows_per_band:
+            result = benchmark_lsh_recall(unique_paragraphs, args.threshold, bands, rows_per_band)
+            print(", ".join(f"{key}={value}" for key, value in result.items()))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run_command_line(sys.argv[1:])
+    else:
+        root = tk.Tk()
+        root.configure(bg="#1a1a2e")
+        app = PDFComparerApp(root)
+        root.mainloop()